@@ -48,6 +48,10 @@ class Settings(BaseSettings):
         default=30,
         description="JWT token expiration time in minutes"
     )
+    ANALYTICS_SALT: Optional[str] = Field(
+        default=None,
+        description="Secret key for hashing user IDs in analytics events"
+    )
     
     # ==========================================================================
     # External API Keys
@@ -161,6 +165,10 @@ class Settings(BaseSettings):
         default="eleven_turbo_v2_5",
         description="ElevenLabs model for TTS"
     )
+    VOSK_WARMUP: bool = Field(
+        default=False,
+        description="Load the Vosk model at startup instead of on first transcription"
+    )
     
     model_config = ConfigDict(
         env_file=".env",
@@ -22,9 +22,6 @@ from .dependencies import (
     get_form_submitter,
     get_gemini_service,
     get_vosk_service,
-    get_speech_data,
-    update_speech_data,
-    clear_speech_data,
 )
 
 __all__ = [
@@ -51,7 +48,4 @@ __all__ = [
     "get_form_submitter",
     "get_gemini_service",
     "get_vosk_service",
-    "get_speech_data",
-    "update_speech_data",
-    "clear_speech_data",
 ]
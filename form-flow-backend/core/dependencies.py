@@ -14,7 +14,8 @@ Usage:
         ...
 """
 
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict
 
 from config.settings import settings
 from utils.logging import get_logger
@@ -116,6 +117,9 @@ def get_gemini_service():
     return _gemini_service
 
 
+_vosk_lock = threading.Lock()
+
+
 def get_vosk_service():
     """
     Get VoskService - LAZY loaded on first transcription request.
@@ -126,34 +130,22 @@ def get_vosk_service():
     global _vosk_service
     
     if _vosk_service is None:
-        _log_lazy_init("VoskService (this may take a moment...)")
-        from services.voice.vosk import VoskService
-        
-        _vosk_service = VoskService()
+        # The startup warmup runs in a worker thread and can race the first
+        # transcription request; load the model only once
+        with _vosk_lock:
+            if _vosk_service is None:
+                _log_lazy_init("VoskService (this may take a moment...)")
+                from services.voice.vosk import VoskService
+                
+                _vosk_service = VoskService()
     
     return _vosk_service
 
 
-# =============================================================================
-# Speech Data Cache (now uses Redis when available)
-# =============================================================================
-
-_global_speech_data: Dict[str, Any] = {}
-
-
-def get_speech_data() -> Dict[str, Any]:
-    """Get speech data cache."""
-    return _global_speech_data
-
-
-def update_speech_data(new_data: Dict[str, Any]) -> None:
-    """Update speech data cache."""
-    _global_speech_data.update(new_data)
-
-
-def clear_speech_data() -> None:
-    """Clear speech data cache."""
-    _global_speech_data.clear()
+def close_services() -> None:
+    """Release resources held by initialized services (called on shutdown)."""
+    if _speech_service is not None:
+        _speech_service.close()
 
 
 # =============================================================================
@@ -34,8 +34,14 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from slowapi.errors import RateLimitExceeded
+from typing import Any
 import uvicorn
 
+try:
+    import orjson
+except ImportError:  # Optional - stdlib json is used when missing
+    orjson = None
+
 from config.settings import settings
 from core import models, database
 from utils.logging import setup_logging, get_logger
@@ -67,6 +73,11 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
     
+    # Start tasks eagerly (3.12+) so coroutines that finish without
+    # suspending skip a round-trip through the event loop scheduler
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     # Create database tables
     async with database.engine.begin() as conn:
         await conn.run_sync(models.Base.metadata.create_all)
@@ -90,7 +101,14 @@ async def lifespan(app: FastAPI):
             
     except Exception as e:
         logger.warning(f"AI dependency check/init failed: {e}")
-    
+
+    # Optionally load the Vosk model in the background so the first
+    # transcription request doesn't pay the multi-second model load
+    if settings.VOSK_WARMUP:
+        from core.dependencies import get_vosk_service
+        asyncio.get_running_loop().run_in_executor(None, get_vosk_service)
+        logger.info("Triggered background warmup of Vosk model")
+
     yield
     
     # Shutdown
@@ -100,6 +118,14 @@ async def lifespan(app: FastAPI):
     from services.form.browser_pool import close_browser_pool
     await close_browser_pool()
     
+    # Release pooled HTTP connections held by lazily-created services
+    from core.dependencies import close_services
+    close_services()
+    
+    # Stop PDF word-extraction worker processes
+    from services.pdf.pdf_parser import shutdown_page_pool
+    shutdown_page_pool()
+    
     await database.engine.dispose()
 
 
@@ -107,11 +133,21 @@ async def lifespan(app: FastAPI):
 # FastAPI Application
 # =============================================================================
 
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available (large form schemas)."""
+    
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="Voice-powered form automation API",
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -22,7 +22,7 @@ Endpoints:
     POST /voice/batch          - Process entire utterance
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
@@ -1002,31 +1002,37 @@ class AnalyticsEventRequest(BaseModel):
     metadata: Optional[Dict[str, Any]] = {}
 
 
+async def _track_event_background(event: Dict[str, Any]) -> None:
+    """Store an analytics event after the response has been sent."""
+    try:
+        from services.ai.analytics import get_form_analytics
+        
+        await get_form_analytics().track_event(event)
+    except Exception as e:
+        logger.error(f"Analytics tracking failed: {e}")
+
+
 @router.post("/analytics/track")
-async def track_analytics_event(request: AnalyticsEventRequest):
+async def track_analytics_event(request: AnalyticsEventRequest, background_tasks: BackgroundTasks):
     """
     Track form interaction events for analytics.
     
     Event types: form_start, form_submit, field_focus, field_blur, 
                  field_change, field_error, voice_start, voice_end
+    
+    The event is stored in the background so focus/blur tracking never
+    waits on Redis.
     """
-    try:
-        from services.ai.analytics import get_form_analytics
-        
-        analytics = get_form_analytics()
-        await analytics.track_event({
-            "type": request.type,
-            "form_id": request.form_id,
-            "session_id": request.session_id,
-            "field_id": request.field_id,
-            "user_id": request.user_id,
-            "metadata": request.metadata
-        })
-        
-        return {"success": True}
-    except Exception as e:
-        logger.error(f"Analytics tracking failed: {e}")
-        return {"success": False, "error": str(e)}
+    background_tasks.add_task(_track_event_background, {
+        "type": request.type,
+        "form_id": request.form_id,
+        "session_id": request.session_id,
+        "field_id": request.field_id,
+        "user_id": request.user_id,
+        "metadata": request.metadata
+    })
+    
+    return {"success": True}
 
 
 @router.get("/analytics/insights/{form_id}")
@@ -5,20 +5,149 @@ Endpoints for uploading and filling Word documents.
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import StreamingResponse
-from typing import Dict, Any
-import io
+from fastapi.responses import FileResponse, StreamingResponse
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+import asyncio
+import os
+import re
+import tempfile
+import time
 import uuid
 
-from services.docx.docx_parser import parse_docx_fields, DocxParser
+from services.docx.docx_parser import parse_docx_fields, check_docx_archive, DocxParser
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/docx", tags=["Word Documents"])
 
-# In-memory storage for uploaded documents (replace with Redis/DB for production)
-_docx_storage: Dict[str, bytes] = {}
+# Documents live on disk, addressed by ID, so every worker sharing the
+# storage directory can serve them; files expire by modification time
+STORAGE_DIR = Path("storage") / "docx"
+UPLOAD_DIR = STORAGE_DIR / "uploads"
+FILLED_DIR = STORAGE_DIR / "filled"
+
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+FILLED_DIR.mkdir(parents=True, exist_ok=True)
+
+# Upload read size - bounds per-request memory regardless of document size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+STREAM_CHUNK_SIZE = 64 * 1024
+# Filled documents up to this size are built in memory before streaming
+FILL_SPOOL_MAX_BYTES = 1024 * 1024
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+UPLOAD_TTL_SECONDS = 3600
+FILLED_TTL_SECONDS = 600
+
+
+def _get_stored_path(directory: Path, doc_id: str, ttl: int) -> Optional[Path]:
+    """Locate a stored document by ID, or None if unknown or expired."""
+    try:
+        doc_id = str(uuid.UUID(doc_id))  # Also rejects path traversal
+    except ValueError:
+        return None
+    
+    path = directory / f"{doc_id}.docx"
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            path.unlink(missing_ok=True)
+            return None
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def _require_upload(docx_id: str) -> Path:
+    """Resolve an uploaded document or raise 404."""
+    upload_path = _get_stored_path(UPLOAD_DIR, docx_id, UPLOAD_TTL_SECONDS)
+    if upload_path is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Document not found. Please re-upload."
+        )
+    return upload_path
+
+
+def _iter_file(fileobj) -> Iterator[bytes]:
+    """Yield a file's contents in chunks, closing it when done."""
+    try:
+        fileobj.seek(0)
+        while chunk := fileobj.read(STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def _sweep_expired() -> None:
+    """Delete uploaded and filled documents past their TTL."""
+    now = time.time()
+    for directory, ttl in ((UPLOAD_DIR, UPLOAD_TTL_SECONDS), (FILLED_DIR, FILLED_TTL_SECONDS)):
+        for path in directory.glob("*.docx"):
+            try:
+                if now - path.stat().st_mtime > ttl:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                continue
+
+
+# Any [bracketed] text; the field is resolved by dict lookup, not per-field regexes
+PLACEHOLDER_PATTERN = re.compile(r'\[([^\[\]]+)\]')
+
+
+def _build_placeholder_lookup(data: Dict[str, str]) -> Dict[str, str]:
+    """Map lowercased placeholder text ([name] and [display name]) to values."""
+    lookup: Dict[str, str] = {}
+    for field_name, value in data.items():
+        lookup.setdefault(field_name.lower(), value)
+        lookup.setdefault(field_name.replace('_', ' ').lower(), value)
+    return lookup
+
+
+def _fill_document(upload_path: Path, data: Dict[str, str], output) -> None:
+    """Replace placeholders in an uploaded document and save it to output (path or stream)."""
+    from docx import Document
+    
+    doc = Document(str(upload_path))
+    
+    # Match both [Name] and [name] style, plus display name variations
+    lookup = _build_placeholder_lookup(data)
+    
+    def replace(match: re.Match) -> str:
+        return lookup.get(match.group(1).lower(), match.group(0))
+    
+    # One scan per run fills every field; runs are only written back if changed
+    for paragraph in doc.paragraphs:
+        for run in paragraph.runs:
+            text = run.text
+            new_text = PLACEHOLDER_PATTERN.sub(replace, text)
+            if new_text != text:
+                run.text = new_text
+    
+    doc.save(output)
+
+
+async def _save_upload_to_disk(file: UploadFile) -> Path:
+    """Stream an upload to a temporary file in 1MB chunks, enforcing the size cap."""
+    with tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, suffix=".docx", delete=False) as tmp:
+        try:
+            written = 0
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Document exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)}MB upload limit."
+                    )
+                tmp.write(chunk)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    return Path(tmp.name)
 
 
 @router.post("/upload")
@@ -41,18 +170,25 @@ async def upload_docx(file: UploadFile = File(...)) -> Dict[str, Any]:
             detail="Only .docx files are supported. Please upload a valid Word document."
         )
     
+    if file.filename.lower().endswith('.doc'):
+        raise HTTPException(
+            status_code=400,
+            detail="Legacy .doc format is not supported. Please save as .docx and re-upload."
+        )
+    
+    _sweep_expired()
+    
+    tmp_path = None
     try:
-        # Read file content
-        content = await file.read()
+        tmp_path = await _save_upload_to_disk(file)
         
-        if file.filename.lower().endswith('.doc'):
-            raise HTTPException(
-                status_code=400,
-                detail="Legacy .doc format is not supported. Please save as .docx and re-upload."
-            )
+        # Reject zip bombs before python-docx inflates the archive
+        rejection = check_docx_archive(tmp_path)
+        if rejection:
+            raise HTTPException(status_code=400, detail=rejection)
         
-        # Parse document
-        result = parse_docx_fields(content)
+        # Parse document straight from disk, off the event loop
+        result = await asyncio.to_thread(parse_docx_fields, str(tmp_path))
         
         if not result.get("success"):
             raise HTTPException(
@@ -62,7 +198,9 @@ async def upload_docx(file: UploadFile = File(...)) -> Dict[str, Any]:
         
         # Store for later filling
         docx_id = result.get("docx_id")
-        _docx_storage[docx_id] = content
+        os.replace(tmp_path, UPLOAD_DIR / f"{docx_id}.docx")
+        tmp_path = None
+        result["file_name"] = file.filename
         
         logger.info(f"Parsed Word document: {file.filename}, {result.get('total_fields')} fields found")
         
@@ -76,53 +214,56 @@ async def upload_docx(file: UploadFile = File(...)) -> Dict[str, Any]:
             status_code=500,
             detail=f"Failed to process document: {str(e)}"
         )
+    finally:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
 
 
 @router.post("/fill")
-async def fill_docx(docx_id: str, data: Dict[str, str]) -> Dict[str, Any]:
+async def fill_docx(docx_id: str, data: Dict[str, str]):
     """
-    Fill a previously uploaded Word document with provided data.
+    Fill a previously uploaded Word document and return it directly.
     
-    This replaces placeholders with actual values.
+    This replaces placeholders with actual values. Use /fill-async to
+    get a download ID instead.
     """
-    if docx_id not in _docx_storage:
+    upload_path = _require_upload(docx_id)
+    
+    # Small documents stay in memory, larger ones spill to disk
+    output = tempfile.SpooledTemporaryFile(max_size=FILL_SPOOL_MAX_BYTES)
+    try:
+        await asyncio.to_thread(_fill_document, upload_path, data, output)
+    except Exception as e:
+        output.close()
+        logger.error(f"Error filling document: {e}", exc_info=True)
         raise HTTPException(
-            status_code=404,
-            detail="Document not found. Please re-upload."
+            status_code=500,
+            detail=f"Failed to fill document: {str(e)}"
         )
     
+    return StreamingResponse(
+        _iter_file(output),
+        media_type=DOCX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": 'attachment; filename="filled_document.docx"'
+        }
+    )
+
+
+@router.post("/fill-async")
+async def fill_docx_async(docx_id: str, data: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Fill a previously uploaded Word document and store it for /download.
+    
+    This replaces placeholders with actual values.
+    """
+    upload_path = _require_upload(docx_id)
+    
     try:
-        from docx import Document
-        
-        # Load original document
-        content = _docx_storage[docx_id]
-        doc = Document(io.BytesIO(content))
-        
-        # Replace placeholders in paragraphs
-        for paragraph in doc.paragraphs:
-            for field_name, value in data.items():
-                # Replace bracket placeholders
-                import re
-                # Match both [Name] and [name] style
-                pattern = re.compile(rf'\[{re.escape(field_name)}\]', re.IGNORECASE)
-                if pattern.search(paragraph.text):
-                    for run in paragraph.runs:
-                        run.text = pattern.sub(value, run.text)
-                        
-                # Also try display name variations
-                display_pattern = re.compile(rf'\[{field_name.replace("_", " ")}\]', re.IGNORECASE)
-                if display_pattern.search(paragraph.text):
-                    for run in paragraph.runs:
-                        run.text = display_pattern.sub(value, run.text)
-        
-        # Save filled document
-        output = io.BytesIO()
-        doc.save(output)
-        output.seek(0)
-        
-        # Generate download ID
+        # python-docx work is blocking; keep concurrent requests responsive
         download_id = str(uuid.uuid4())
-        _docx_storage[f"filled_{download_id}"] = output.getvalue()
+        filled_path = FILLED_DIR / f"{download_id}.docx"
+        await asyncio.to_thread(_fill_document, upload_path, data, str(filled_path))
         
         return {
             "success": True,
@@ -142,20 +283,17 @@ async def fill_docx(docx_id: str, data: Dict[str, str]) -> Dict[str, Any]:
 @router.get("/download/{download_id}")
 async def download_docx(download_id: str):
     """Download a filled Word document."""
-    storage_key = f"filled_{download_id}"
+    filled_path = _get_stored_path(FILLED_DIR, download_id, FILLED_TTL_SECONDS)
     
-    if storage_key not in _docx_storage:
+    if filled_path is None:
         raise HTTPException(
             status_code=404,
             detail="Document not found or expired."
         )
     
-    content = _docx_storage[storage_key]
-    
-    return StreamingResponse(
-        io.BytesIO(content),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={
-            "Content-Disposition": f"attachment; filename=filled_document.docx"
-        }
+    # Stream straight from disk in chunks instead of buffering the whole file
+    return FileResponse(
+        filled_path,
+        media_type=DOCX_MEDIA_TYPE,
+        filename="filled_document.docx",
     )
@@ -4,11 +4,12 @@ from typing import Dict, List, Any
 from pydantic import BaseModel
 import asyncio
 import json
+import uuid
 
 from services.form.parser import get_form_schema, create_template
 from core.dependencies import (
     get_voice_processor, get_speech_service, get_form_submitter, 
-    get_gemini_service, update_speech_data
+    get_gemini_service
 )
 from services.voice.processor import VoiceProcessor
 from services.voice.speech import SpeechService
@@ -21,6 +22,7 @@ import auth
 from config.settings import settings
 from sqlalchemy.future import select
 from services.ai.profile.service import generate_profile_background
+from utils.api_cache import cache_session_speech
 
 # --- Pydantic Models ---
 class ScrapeRequest(BaseModel):
@@ -56,6 +58,17 @@ class MagicFillRequest(BaseModel):
 router = APIRouter(tags=["Forms & Automation"])
 
 # --- Helper Logic ---
+def _count_fields(form_schema: List[Dict[str, Any]]) -> tuple:
+    """Return (total, visible) field counts in a single pass over the schema."""
+    total_fields = visible_fields = 0
+    for form in form_schema:
+        for field in form.get('fields', []):
+            total_fields += 1
+            if not field.get('hidden', False) and field.get('type') != 'submit':
+                visible_fields += 1
+    return total_fields, visible_fields
+
+
 async def _process_scraped_form(
     url: str, 
     voice_processor: VoiceProcessor,
@@ -70,53 +83,51 @@ async def _process_scraped_form(
     
     # Generate speech
     speech_data = {}
+    speech_session = None
     if generate_speech:
         print("Generating speech for fields...")
-        for form in form_schema:
-            for field in form.get('fields', []):
-                fname = field.get('name')
-                if fname:
-                    prompt = speech_service._create_field_prompt(field)
-                    audio = speech_service.text_to_speech(prompt)
-                    if audio:
-                        speech_data[fname] = {'audio': audio}
+        # Prompts are synthesized concurrently (and deduplicated) in a worker
+        # thread so the event loop stays free during the ElevenLabs calls
+        speech_data = await asyncio.to_thread(
+            speech_service.generate_form_speech,
+            [field for form in form_schema for field in form.get('fields', [])]
+        )
         
-        # Update global state
         if speech_data:
-            update_speech_data(speech_data)
+            # Scope audio to this scrape so concurrent sessions with the same
+            # field names don't clobber each other, and so every worker can
+            # serve it (shared cache when Redis is configured, otherwise the
+            # bounded in-memory fallback). Clients without a session fall
+            # back to on-demand TTS in /speech.
+            speech_session = uuid.uuid4().hex
+            await asyncio.gather(*(
+                cache_session_speech(speech_session, fname, entry['audio'])
+                for fname, entry in speech_data.items()
+            ))
     
     # Generate form context for LLM
     form_context = voice_processor.analyze_form_context(form_schema)
     
-    # Generate initial prompts for each field
-    enhanced_schema = []
+    # Generate initial prompts for each field. get_form_schema hands every
+    # caller its own copy of the schema, so annotate the fields in place
     for form in form_schema:
-        enhanced_form = form.copy()
-        enhanced_form['fields'] = []
         for field in form['fields']:
-            enhanced_field = field.copy()
-            enhanced_field['smart_prompt'] = voice_processor.generate_smart_prompt(form_context, field)
-            enhanced_form['fields'].append(enhanced_field)
-        enhanced_schema.append(enhanced_form)
-
-    # Statistics
-    total_fields = sum(len(form.get('fields', [])) for form in form_schema)
-    non_hidden_fields = sum(
-        1 for form in form_schema 
-        for field in form.get('fields', []) 
-        if not field.get('hidden', False) and field.get('type') != 'submit'
-    )
+            field['smart_prompt'] = voice_processor.generate_smart_prompt(form_context, field)
+    
+    # Statistics (same counting as /analyze-extracted-fields)
+    total_fields, visible_fields = _count_fields(form_schema)
     
     return {
-        "form_schema": enhanced_schema,
+        "form_schema": form_schema,
         "form_template": create_template(form_schema),
         "form_context": form_context,
         "speech_available": len(speech_data) > 0,
         "speech_fields": list(speech_data.keys()),
+        "speech_session": speech_session,
         "statistics": {
             "total_fields": total_fields,
-            "visible_fields": non_hidden_fields,
-            "hidden_fields": total_fields - non_hidden_fields
+            "visible_fields": visible_fields,
+            "hidden_fields": total_fields - visible_fields
         }
     }
 
@@ -289,21 +300,18 @@ async def analyze_extracted_fields(
             data.form_schema
         )
         
-        total_fields = sum(len(form.get('fields', [])) for form in data.form_schema)
-        non_hidden_fields = sum(
-            1 for form in data.form_schema 
-            for field in form.get('fields', []) 
-            if not field.get('hidden', False) and field.get('type') != 'submit'
-        )
+        # Completion is measured against fillable (visible) fields, which is
+        # what this endpoint has always reported as total_fields
+        _, visible_fields = _count_fields(data.form_schema)
         extracted_count = len(data.extracted_fields)
-        completion_percentage = (extracted_count / non_hidden_fields * 100) if non_hidden_fields > 0 else 0
+        completion_percentage = (extracted_count / visible_fields * 100) if visible_fields > 0 else 0
         
         return {
             "message": "Field analysis completed",
             "extracted_fields": data.extracted_fields,
             "remaining_fields": remaining_fields,
             "statistics": {
-                "total_fields": non_hidden_fields,
+                "total_fields": visible_fields,
                 "extracted_count": extracted_count,
                 "remaining_count": len(remaining_fields),
                 "completion_percentage": round(completion_percentage, 1)
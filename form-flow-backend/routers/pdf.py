@@ -12,15 +12,17 @@ Integrates with existing conversation agent for voice-powered filling.
 
 import logging
 import asyncio
+import hashlib
+import json
 import tempfile
+import time
 import os
 import traceback
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
-import io
 import uuid
 
 from config.settings import settings
@@ -78,10 +80,24 @@ class PreviewFillRequest(BaseModel):
 STORAGE_DIR = Path("storage")
 UPLOAD_DIR = STORAGE_DIR / "uploads"
 FILLED_DIR = STORAGE_DIR / "filled"
+SCHEMA_CACHE_DIR = STORAGE_DIR / "schema_cache"
+
+# Bump when parser output changes so stale cached schemas are ignored
+SCHEMA_CACHE_VERSION = "v1"
+
+# Cached schemas expire with the uploads they came from (see _cleanup_pdf)
+SCHEMA_CACHE_TTL_SECONDS = 3600
+
+# Values typed into a user's PDF never go into the shared schema cache
+_SCHEMA_VALUE_KEYS = frozenset({"default_value", "current_value"})
+
+# Per-upload details, rebuilt on every request rather than shared
+_SCHEMA_UPLOAD_KEYS = frozenset({"file_name", "file_path"})
 
 # Ensure directories exist
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 FILLED_DIR.mkdir(parents=True, exist_ok=True)
+SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 def _save_upload(pdf_id: str, content: bytes, metadata: Dict[str, Any]):
     """Save uploaded PDF and metadata to disk."""
@@ -92,12 +108,11 @@ def _save_upload(pdf_id: str, content: bytes, metadata: Dict[str, Any]):
     
     # Save Metadata
     meta_path = UPLOAD_DIR / f"{pdf_id}.json"
-    import json
     with open(meta_path, "w") as f:
         json.dump(metadata, f)
 
-def _get_upload(pdf_id: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
-    """Retrieve uploaded PDF and metadata from disk."""
+def _get_upload_metadata(pdf_id: str) -> Optional[Dict[str, Any]]:
+    """Retrieve upload metadata from disk without reading the PDF itself."""
     logger.info(f"🔍 SEARCHING for upload {pdf_id} in {UPLOAD_DIR}")
     pdf_path = UPLOAD_DIR / f"{pdf_id}.pdf"
     meta_path = UPLOAD_DIR / f"{pdf_id}.json"
@@ -105,25 +120,84 @@ def _get_upload(pdf_id: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
     if not pdf_path.exists() or not meta_path.exists():
         logger.warning(f"❌ Upload {pdf_id} NOT FOUND at {pdf_path}")
         return None
-        
-    content = pdf_path.read_bytes()
-    import json
+    
     with open(meta_path, "r") as f:
-        metadata = json.load(f)
-        
-    return content, metadata
+        return json.load(f)
+
+def _read_upload_pdf(pdf_id: str) -> bytes:
+    """Read an uploaded PDF's bytes from disk."""
+    return (UPLOAD_DIR / f"{pdf_id}.pdf").read_bytes()
+
+def _schema_cache_key(content: bytes) -> str:
+    """Content-address a PDF so identical uploads share one parsed schema."""
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return f"{SCHEMA_CACHE_VERSION}-{digest}"
+
+def _get_cached_schema(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Load a previously parsed schema, or None on a cache miss."""
+    path = SCHEMA_CACHE_DIR / f"{cache_key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > SCHEMA_CACHE_TTL_SECONDS:
+            path.unlink(missing_ok=True)
+            return None
+    except FileNotFoundError:
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable schema cache entry {cache_key}: {e}")
+        return None
+
+def _strip_field_values(data: Any) -> Any:
+    """Copy a schema without any field default/current values."""
+    if isinstance(data, dict):
+        return {
+            k: _strip_field_values(v)
+            for k, v in data.items()
+            if k not in _SCHEMA_VALUE_KEYS
+        }
+    if isinstance(data, list):
+        return [_strip_field_values(v) for v in data]
+    return data
+
+def _shared_schema(schema_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Content-derived part of a schema: no field values or upload details."""
+    return {
+        k: v
+        for k, v in _strip_field_values(schema_dict).items()
+        if k not in _SCHEMA_UPLOAD_KEYS
+    }
+
+def _sweep_schema_cache():
+    """Delete cached schemas older than the upload retention."""
+    now = time.time()
+    for path in SCHEMA_CACHE_DIR.glob("*.json"):
+        try:
+            if now - path.stat().st_mtime > SCHEMA_CACHE_TTL_SECONDS:
+                path.unlink(missing_ok=True)
+        except OSError:
+            continue
+
+def _save_cached_schema(cache_key: str, schema_dict: Dict[str, Any]):
+    """Persist a shared schema (see _shared_schema) under its content hash."""
+    try:
+        with open(SCHEMA_CACHE_DIR / f"{cache_key}.json", "w") as f:
+            json.dump(schema_dict, f)
+    except (OSError, TypeError) as e:
+        logger.warning(f"Could not cache schema {cache_key}: {e}")
 
 def _save_filled(download_id: str, content: bytes):
     """Save filled PDF to disk."""
     path = FILLED_DIR / f"{download_id}.pdf"
     path.write_bytes(content)
 
-def _get_filled(download_id: str) -> Optional[bytes]:
-    """Retrieve filled PDF from disk."""
+def _get_filled_path(download_id: str) -> Optional[Path]:
+    """Locate a filled PDF on disk."""
     path = FILLED_DIR / f"{download_id}.pdf"
     if not path.exists():
         return None
-    return path.read_bytes()
+    return path
 
 async def _cleanup_pdf(pdf_id: str):
     """Remove PDF from storage after timeout."""
@@ -186,37 +260,60 @@ async def upload_pdf(
             detail=f"Error reading file: {str(e)}"
         )
     
-    # Parse PDF
-    try:
-        logger.info(f"Parsing PDF: {file.filename}")
-        loop = asyncio.get_event_loop()
-        schema = await loop.run_in_executor(None, lambda: parse_pdf(content, use_ocr=False))
-        logger.info(f"Parsed {schema.total_fields} fields from {file.filename}")
-    except ImportError as e:
-        logger.error(f"Import error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="PDF parsing libraries not installed. Run: pip install pdfplumber pypdf"
-        )
-    except Exception as e:
-        logger.error(f"Error parsing PDF: {e}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(
-            status_code=400,
-            detail=f"Error parsing PDF: {str(e)}"
-        )
+    # Parse PDF (skipped when the same content was parsed before)
+    _sweep_schema_cache()
+    cache_key = _schema_cache_key(content)
+    schema_dict = _get_cached_schema(cache_key)
+    
+    if schema_dict is not None:
+        logger.info(f"Schema cache hit for {file.filename} ({cache_key})")
+    else:
+        try:
+            logger.info(f"Parsing PDF: {file.filename}")
+            loop = asyncio.get_event_loop()
+            schema = await loop.run_in_executor(None, lambda: parse_pdf(content, use_ocr=False))
+            logger.info(f"Parsed {schema.total_fields} fields from {file.filename}")
+        except ImportError as e:
+            logger.error(f"Import error: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail="PDF parsing libraries not installed. Run: pip install pdfplumber pypdf"
+            )
+        except Exception as e:
+            logger.error(f"Error parsing PDF: {e}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=400,
+                detail=f"Error parsing PDF: {str(e)}"
+            )
+        
+        try:
+            # Misses return exactly what later hits for the same bytes return
+            schema_dict = _shared_schema(schema.to_dict())
+        except Exception as e:
+            logger.error(f"Error converting schema to dict: {e}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error processing PDF schema: {str(e)}"
+            )
+        _save_cached_schema(cache_key, schema_dict)
     
     # Generate ID and store
     pdf_id = str(uuid.uuid4())
+    schema_dict = {
+        **schema_dict,
+        "file_name": file.filename,
+        "file_path": str(UPLOAD_DIR / f"{pdf_id}.pdf"),
+    }
     
     try:
-        schema_dict = schema.to_dict()
         _save_upload(pdf_id, content, {
             "file_name": file.filename,
             "schema": schema_dict,
         })
     except Exception as e:
-        logger.error(f"Error converting schema to dict: {e}")
+        logger.error(f"Error saving upload: {e}")
         logger.error(traceback.format_exc())
         raise HTTPException(
             status_code=500,
@@ -227,18 +324,17 @@ async def upload_pdf(
     if background_tasks:
         background_tasks.add_task(_cleanup_pdf, pdf_id)
     
-    # Format fields for response
-    fields = [f.to_dict() for f in schema.fields]
+    total_fields = schema_dict["total_fields"]
     
     return PdfUploadResponse(
         success=True,
         pdf_id=pdf_id,
         file_name=file.filename,
-        total_pages=schema.total_pages,
-        total_fields=schema.total_fields,
-        fields=fields,
-        is_scanned=schema.is_scanned,
-        message=f"Found {schema.total_fields} fillable fields",
+        total_pages=schema_dict["total_pages"],
+        total_fields=total_fields,
+        fields=schema_dict["fields"],
+        is_scanned=schema_dict["is_scanned"],
+        message=f"Found {total_fields} fillable fields",
     )
 
 
@@ -249,14 +345,13 @@ async def get_pdf_schema(pdf_id: str):
     
     Returns field information in format compatible with conversation agent.
     """
-    upload_data = _get_upload(pdf_id)
-    if not upload_data:
+    metadata = _get_upload_metadata(pdf_id)
+    if not metadata:
         raise HTTPException(
             status_code=404,
             detail="PDF not found. Upload again."
         )
     
-    _, metadata = upload_data
     schema = metadata["schema"]
     
     # Convert to conversation-agent compatible format
@@ -289,14 +384,13 @@ async def preview_fill(request: PreviewFillRequest):
     
     Shows text fitting results without creating actual PDF.
     """
-    upload_data = _get_upload(request.pdf_id)
-    if not upload_data:
+    metadata = _get_upload_metadata(request.pdf_id)
+    if not metadata:
         raise HTTPException(
             status_code=404,
             detail="PDF not found. Upload again."
         )
     
-    pdf_bytes, metadata = upload_data
     fields_dict = {f["name"]: f for f in metadata["schema"]["fields"]}
     
     fitter = TextFitter()
@@ -338,22 +432,39 @@ async def fill_pdf_endpoint(
     
     Returns download ID for retrieving filled PDF.
     """
-    upload_data = _get_upload(request.pdf_id)
-    if not upload_data:
+    metadata = _get_upload_metadata(request.pdf_id)
+    if not metadata:
         raise HTTPException(
             status_code=404,
             detail="PDF not found. Upload again."
         )
     
-    pdf_bytes, metadata = upload_data
+    pdf_bytes = _read_upload_pdf(request.pdf_id)
+    
+    # Nothing to fill (e.g. a scan OCR found nothing in): hand back the
+    # template unchanged instead of running the fill pass
+    if not metadata["schema"].get("total_fields"):
+        download_id = str(uuid.uuid4())
+        _save_filled(download_id, pdf_bytes)
+        background_tasks.add_task(_cleanup_filled, download_id)
+        return FillPdfResponse(
+            success=True,
+            download_id=download_id,
+            fields_filled=0,
+            fields_failed=0,
+            warnings=["PDF has no fillable fields; the template was returned unchanged"],
+        )
+    
     logger.info(f"📄 Filling PDF: {metadata.get('file_name', 'unknown')}, template size: {len(pdf_bytes)} bytes")
     logger.info(f"📝 Data fields: {list(request.data.keys())}")
     
     try:
+        # Reuse the schema parsed at upload time instead of parsing again
         result = fill_pdf(
             template_path=pdf_bytes,
             data=request.data,
             flatten=request.flatten,
+            schema=PdfFormSchema.from_dict(metadata["schema"]),
         )
         
         # DEBUG: Log result details
@@ -429,19 +540,18 @@ async def download_filled_pdf(download_id: str):
     
     The download_id is returned from the /fill endpoint.
     """
-    pdf_bytes = _get_filled(download_id)
-    if not pdf_bytes:
+    pdf_path = _get_filled_path(download_id)
+    if not pdf_path:
         raise HTTPException(
             status_code=404,
             detail="Filled PDF not found or expired. Fill again."
         )
     
-    return StreamingResponse(
-        io.BytesIO(pdf_bytes),
+    # Stream straight from disk in chunks instead of buffering the whole file
+    return FileResponse(
+        pdf_path,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=filled_form_{download_id[:8]}.pdf"
-        }
+        filename=f"filled_form_{download_id[:8]}.pdf",
     )
 
 
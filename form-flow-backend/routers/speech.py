@@ -8,18 +8,28 @@ Endpoints:
     POST /transcribe - Transcribe audio to text using Vosk
 """
 
+import asyncio
+import hashlib
+
 from fastapi import APIRouter, HTTPException, Depends, Response, UploadFile, File
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from services.voice.speech import SpeechService
 from services.voice.vosk import VoskService
-from core.dependencies import get_speech_service, get_vosk_service, get_speech_data
+from core.dependencies import get_speech_service, get_vosk_service
 from utils.logging import get_logger, log_api_call
+from utils.api_cache import get_session_speech
 
 logger = get_logger(__name__)
 
 router = APIRouter(tags=["Speech & Audio"])
 
+# Vosk decoding is CPU-bound: cap concurrent decodes and collapse identical
+# in-flight uploads (retries, duplicate tabs) onto a single decode
+MAX_CONCURRENT_TRANSCRIPTIONS = 4
+_transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+_inflight_transcriptions: Dict[bytes, "asyncio.Task[Dict[str, Any]]"] = {}
+
 
 # =============================================================================
 # Text-to-Speech
@@ -38,17 +48,18 @@ router = APIRouter(tags=["Speech & Audio"])
 )
 async def get_field_speech_audio(
     field_name: str,
-    speech_service: SpeechService = Depends(get_speech_service),
-    speech_data: dict = Depends(get_speech_data)
+    session: Optional[str] = None,
+    speech_service: SpeechService = Depends(get_speech_service)
 ):
     """
     Get text-to-speech audio for a specific form field.
     
-    First checks the speech cache for pre-generated audio.
+    First checks the scrape session's cache for pre-generated audio.
     If not found, generates audio on-demand using ElevenLabs.
     
     Args:
         field_name: Name of the form field
+        session: speech_session returned by /scrape (optional)
         
     Returns:
         Response: Audio file as audio/mpeg
@@ -59,18 +70,20 @@ async def get_field_speech_audio(
     try:
         logger.debug(f"Speech requested for field: {field_name}")
         
-        # Check cache first
-        if field_name in speech_data:
-            audio_data = speech_data[field_name].get('audio')
+        # Check the scrape session's audio first
+        if session:
+            audio_data = await get_session_speech(session, field_name)
             if audio_data:
-                logger.debug(f"Returning cached audio for: {field_name}")
+                logger.debug(f"Returning session audio for: {field_name}")
                 return Response(content=audio_data, media_type="audio/mpeg")
         
         # Generate on demand if not cached
         logger.info(f"Generating speech on demand for: {field_name}")
         field_info = {'name': field_name, 'type': 'text', 'label': field_name}
         prompt_text = speech_service._create_field_prompt(field_info)
-        audio_data = speech_service.text_to_speech(prompt_text)
+        # Blocking HTTP call; run it off the event loop so concurrent
+        # requests (and transcriptions) aren't serialized behind it
+        audio_data = await asyncio.to_thread(speech_service.text_to_speech, prompt_text)
         
         if audio_data:
             log_api_call("ElevenLabs", "text-to-speech", success=True)
@@ -93,6 +106,45 @@ async def get_field_speech_audio(
 # Speech-to-Text
 # =============================================================================
 
+async def _run_transcription(
+    vosk_service: VoskService,
+    audio_data: bytes,
+    sample_rate: int
+) -> Dict[str, Any]:
+    """Decode audio in a worker thread, bounded by the transcription semaphore."""
+    async with _transcription_semaphore:
+        return await asyncio.to_thread(
+            vosk_service.transcribe_audio, audio_data, sample_rate
+        )
+
+
+async def _transcribe_deduplicated(
+    vosk_service: VoskService,
+    audio_data: bytes,
+    sample_rate: int = 16000
+) -> Dict[str, Any]:
+    """
+    Transcribe audio, sharing the result with concurrent identical requests.
+    
+    The decode runs off the event loop; callers with byte-identical audio
+    await the same task instead of decoding again.
+    """
+    key = hashlib.blake2b(audio_data, digest_size=16).digest()
+    task = _inflight_transcriptions.get(key)
+    
+    if task is None:
+        task = asyncio.create_task(
+            _run_transcription(vosk_service, audio_data, sample_rate)
+        )
+        _inflight_transcriptions[key] = task
+        task.add_done_callback(lambda _: _inflight_transcriptions.pop(key, None))
+    else:
+        logger.debug("Joining in-flight transcription for identical audio")
+    
+    # Shield so one client disconnecting does not cancel the shared decode
+    return await asyncio.shield(task)
+
+
 @router.post(
     "/transcribe",
     summary="Transcribe audio to text",
@@ -150,7 +202,7 @@ async def transcribe_audio(
         logger.info(f"Transcribing audio: {len(audio_data)} bytes, type: {content_type}")
         
         # Transcribe using Vosk (16kHz sample rate expected)
-        result = vosk_service.transcribe_audio(audio_data, sample_rate=16000)
+        result = await _transcribe_deduplicated(vosk_service, audio_data, sample_rate=16000)
         
         if result["success"]:
             transcript = result["transcript"]
@@ -12,16 +12,61 @@ Features:
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from collections import defaultdict
+from dataclasses import dataclass, field
+import asyncio
 import hashlib
+import heapq
 import json
 
+try:
+    import orjson
+except ImportError:  # Optional - stdlib json is used when missing
+    orjson = None
+
+from config.settings import settings
 from utils.logging import get_logger
-from utils.cache import get_cached, set_cached
+from utils.cache import (
+    get_cached, set_cached, push_capped, get_list_tail, incr_hash, get_hash_counters
+)
 
 logger = get_logger(__name__)
 
+# Per-form raw event retention
+MAX_EVENTS_PER_FORM = 1000
+EVENTS_TTL_SECONDS = 30 * 24 * 3600
+INSIGHTS_TTL_SECONDS = 3600
+
+# Event (de)serialization - the hot path of both tracking and insights
+if orjson is not None:
+    _dump_event = orjson.dumps
+    _load_event = orjson.loads
+else:
+    def _dump_event(event: Dict[str, Any]) -> str:
+        return json.dumps(event, separators=(',', ':'))
+    _load_event = json.loads
+
+# BLAKE2b keys are limited to 64 bytes
+_MAX_SALT_BYTES = 64
+
+
+def _load_analytics_salt() -> bytes:
+    """Key for hashing user IDs: ANALYTICS_SALT, else derived from SECRET_KEY."""
+    if settings.ANALYTICS_SALT:
+        salt = settings.ANALYTICS_SALT.encode("utf-8")
+        if len(salt) > _MAX_SALT_BYTES:
+            raise ValueError(f"ANALYTICS_SALT must be at most {_MAX_SALT_BYTES} bytes")
+        return salt
+    
+    logger.warning("ANALYTICS_SALT not set - deriving the analytics hashing key from SECRET_KEY")
+    return hashlib.blake2b(
+        settings.SECRET_KEY.encode("utf-8"), digest_size=32, person=b"ff-analytics"
+    ).digest()
+
+
+_ANALYTICS_SALT = _load_analytics_salt()
+
 
 class EventType:
     """Analytics event types"""
@@ -39,6 +84,28 @@ class EventType:
     SUGGESTION_ACCEPTED = "suggestion_accepted"
 
 
+def _event_ts(event: Dict[str, Any]) -> float:
+    """Epoch seconds of an event, parsed from its ISO timestamp (0 if invalid)."""
+    try:
+        return datetime.fromisoformat(event['timestamp']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class _InsightsAccumulator:
+    """Counters filled by one pass over a form's events."""
+    sessions: Dict[str, Dict] = field(default_factory=dict)
+    field_times: Dict[str, List[int]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[Tuple[str, str], int] = field(default_factory=lambda: defaultdict(int))
+    session_last_field: Dict[str, str] = field(default_factory=dict)
+    abandonments: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    voice_sessions: int = 0
+    voice_errors: int = 0
+    clarifications_shown: int = 0
+    suggestions_accepted: int = 0
+
+
 class FormAnalytics:
     """
     Track and analyze form performance.
@@ -46,8 +113,10 @@ class FormAnalytics:
     """
     
     def __init__(self):
-        self._events_key_prefix = "analytics:events"
+        # v2: Redis list of events (v1 keys held one JSON string)
+        self._events_key_prefix = "analytics:events:v2"
         self._insights_key_prefix = "analytics:insights"
+        self._daily_key_prefix = "analytics:events_daily"
     
     async def track_event(self, event: Dict[str, Any]) -> None:
         """
@@ -68,33 +137,41 @@ class FormAnalytics:
         }
         """
         # Privacy: hash user ID if present
-        if 'user_id' in event:
+        if event.get('user_id'):
             event['user_id'] = self._hash_id(event['user_id'])
         
         # Privacy: never store actual values
         if 'value' in event.get('metadata', {}):
             del event['metadata']['value']
         
-        # Add timestamp if not present
+        # Add timestamp if not present; 'ts' (epoch seconds) is what the
+        # insights math compares, 'timestamp' stays for readability
         if 'timestamp' not in event:
-            event['timestamp'] = datetime.now().isoformat()
+            now = datetime.now()
+            event['timestamp'] = now.isoformat()
+            event['ts'] = now.timestamp()
+        else:
+            event['ts'] = _event_ts(event)
         
         # Store event
         form_id = event.get('form_id', 'unknown')
         events_key = f"{self._events_key_prefix}:{form_id}"
         
-        # Get existing events
-        existing = await get_cached(events_key)
-        events = json.loads(existing) if existing else []
-        
-        # Add new event
-        events.append(event)
-        
-        # Keep only last 1000 events per form
-        events = events[-1000:]
-        
-        # Save with 30-day expiry
-        await set_cached(events_key, json.dumps(events), expire=30 * 24 * 3600)
+        # Append only the new event; Redis trims the list to the last 1000
+        await push_capped(
+            events_key,
+            _dump_event(event),
+            max_len=MAX_EVENTS_PER_FORM,
+            ttl=EVENTS_TTL_SECONDS,
+        )
+        
+        # Per-day counters outlive the 1000-event cap on busy forms
+        day = datetime.now().strftime('%Y%m%d')
+        await incr_hash(
+            f"{self._daily_key_prefix}:{form_id}:{day}",
+            event['type'],
+            ttl=EVENTS_TTL_SECONDS,
+        )
         
         logger.debug(f"Tracked event: {event['type']} for form {form_id}")
     
@@ -116,82 +193,126 @@ class FormAnalytics:
         }
         """
         # Try cache first
-        cache_key = f"{self._insights_key_prefix}:{form_id}"
+        cache_key = f"{self._insights_key_prefix}:{form_id}:{days}"
         cached = await get_cached(cache_key)
         if cached:
-            return json.loads(cached)
+            return cached
         
         # Get events
         events_key = f"{self._events_key_prefix}:{form_id}"
-        events_raw = await get_cached(events_key)
-        events = json.loads(events_raw) if events_raw else []
+        events_raw = await get_list_tail(events_key, MAX_EVENTS_PER_FORM)
+        events = [_load_event(e) for e in events_raw]
         
-        if not events:
-            return {
-                "summary": {},
-                "bottlenecks": [],
-                "error_hotspots": [],
-                "dropout_points": [],
-                "recommendations": []
-            }
+        # No early return when the raw list is empty (trimmed or expired):
+        # the empty sections keep the usual shape and the per-day counters
+        # may still outlive the events
+        has_events = bool(events)
         
         # Filter by date
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        events = [e for e in events if e.get('timestamp', '') >= cutoff]
+        cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+        for e in events:
+            if 'ts' not in e:  # Stored before epoch timestamps were added
+                e['ts'] = _event_ts(e)
+        events = [e for e in events if e['ts'] >= cutoff_ts]
+        
+        # Calculate insights from a single pass over the events
+        acc = self._accumulate(events)
+        bottlenecks = self._identify_bottlenecks(acc)
+        error_hotspots = self._identify_errors(acc)
+        dropout_points = self._identify_dropouts(acc)
         
-        # Calculate insights
         insights = {
-            "summary": self._calculate_summary(events),
-            "bottlenecks": self._identify_bottlenecks(events),
-            "error_hotspots": self._identify_errors(events),
-            "dropout_points": self._identify_dropouts(events),
-            "voice_stats": self._calculate_voice_stats(events),
-            "recommendations": self._generate_recommendations(events)
+            "summary": self._calculate_summary(acc),
+            "bottlenecks": bottlenecks,
+            "error_hotspots": error_hotspots,
+            "dropout_points": dropout_points,
+            "voice_stats": self._calculate_voice_stats(acc),
+            "recommendations": self._generate_recommendations(
+                bottlenecks, error_hotspots, dropout_points
+            ),
+            "daily_event_counts": await self._get_daily_counts(form_id, days)
         }
         
-        # Cache for 1 hour
-        await set_cached(cache_key, json.dumps(insights), expire=3600)
+        # Cache for 1 hour; empty results are not cached so the first events
+        # of a new form show up straight away
+        if has_events:
+            await set_cached(cache_key, insights, ttl=INSIGHTS_TTL_SECONDS)
         
         return insights
     
-    def _calculate_summary(self, events: List[Dict]) -> Dict[str, Any]:
-        """Calculate basic form metrics."""
-        sessions: Dict[str, Dict] = {}
+    async def _get_daily_counts(self, form_id: str, days: int) -> Dict[str, Dict[str, int]]:
+        """Read per-day event type counters for the last ``days`` days."""
+        today = datetime.now()
+        dates = [(today - timedelta(days=i)).strftime('%Y%m%d') for i in range(days)]
+        counters = await asyncio.gather(*(
+            get_hash_counters(f"{self._daily_key_prefix}:{form_id}:{day}")
+            for day in dates
+        ))
+        return {day: counts for day, counts in zip(dates, counters) if counts}
+    
+    def _accumulate(self, events: List[Dict]) -> "_InsightsAccumulator":
+        """Walk the events once, feeding every insight section's counters."""
+        acc = _InsightsAccumulator()
+        sessions = acc.sessions
         
         for event in events:
-            sid = event.get('session_id', 'unknown')
             etype = event['type']
+            metadata = event.get('metadata') or {}
+            sid = event.get('session_id', 'unknown')
             
-            if sid not in sessions:
-                sessions[sid] = {
+            s = sessions.get(sid)
+            if s is None:
+                s = sessions[sid] = {
                     'started': False,
                     'completed': False,
                     'abandoned': False,
                     'fields_filled': 0,
                     'errors': 0,
                     'voice_used': False,
-                    'start_time': None,
-                    'end_time': None
+                    'start_ts': None,
+                    'end_ts': None
                 }
             
-            s = sessions[sid]
-            timestamp = event.get('timestamp')
-            
-            if etype == EventType.FORM_START:
+            if etype == EventType.FIELD_FOCUS or etype == EventType.FIELD_BLUR:
+                field_id = event.get('field_id', '')
+                duration = metadata.get('duration', 0)
+                if field_id and duration > 0:
+                    acc.field_times[field_id].append(duration)
+                if etype == EventType.FIELD_FOCUS:
+                    acc.session_last_field[sid] = field_id
+            elif etype == EventType.FIELD_CHANGE:
+                s['fields_filled'] += 1
+            elif etype == EventType.FIELD_ERROR:
+                s['errors'] += 1
+                field_id = event.get('field_id', 'unknown')
+                acc.errors[(field_id, metadata.get('error', 'Unknown error'))] += 1
+            elif etype == EventType.FORM_START:
                 s['started'] = True
-                s['start_time'] = timestamp
+                s['start_ts'] = event['ts']
             elif etype == EventType.FORM_SUBMIT:
                 s['completed'] = True
-                s['end_time'] = timestamp
+                s['end_ts'] = event['ts']
             elif etype == EventType.FORM_ABANDON:
                 s['abandoned'] = True
-                s['end_time'] = timestamp
-            elif etype == EventType.FIELD_CHANGE:
-                s['fields_filled'] += 1
-            elif etype == EventType.FIELD_ERROR:
-                s['errors'] += 1
-            elif etype in [EventType.VOICE_START, EventType.VOICE_END]:
+                s['end_ts'] = event['ts']
+                acc.abandonments[acc.session_last_field.get(sid, 'unknown')] += 1
+            elif etype == EventType.VOICE_START:
+                s['voice_used'] = True
+                acc.voice_sessions += 1
+            elif etype == EventType.VOICE_END:
                 s['voice_used'] = True
+            elif etype == EventType.VOICE_ERROR:
+                acc.voice_errors += 1
+            elif etype == EventType.CLARIFICATION_SHOWN:
+                acc.clarifications_shown += 1
+            elif etype == EventType.SUGGESTION_ACCEPTED:
+                acc.suggestions_accepted += 1
+        
+        return acc
+    
+    def _calculate_summary(self, acc: "_InsightsAccumulator") -> Dict[str, Any]:
+        """Calculate basic form metrics."""
+        sessions = acc.sessions
         
         # Calculate rates
         total = len(sessions)
@@ -203,15 +324,11 @@ class FormAnalytics:
         voice_users = sum(1 for s in sessions.values() if s['voice_used'])
         
         # Calculate avg completion time
-        times = []
-        for s in sessions.values():
-            if s['completed'] and s['start_time'] and s['end_time']:
-                try:
-                    start = datetime.fromisoformat(s['start_time'])
-                    end = datetime.fromisoformat(s['end_time'])
-                    times.append((end - start).total_seconds())
-                except:
-                    pass
+        times = [
+            s['end_ts'] - s['start_ts']
+            for s in sessions.values()
+            if s['completed'] and s['start_ts'] and s['end_ts']
+        ]
         
         avg_time = sum(times) / len(times) if times else 0
         
@@ -229,116 +346,65 @@ class FormAnalytics:
             "voice_usage_rate": round(voice_users / total, 3)
         }
     
-    def _identify_bottlenecks(self, events: List[Dict]) -> List[Dict]:
+    def _identify_bottlenecks(self, acc: "_InsightsAccumulator") -> List[Dict]:
         """Find fields where users spend most time."""
-        field_times: Dict[str, List[int]] = defaultdict(list)
-        
-        for event in events:
-            if event['type'] in [EventType.FIELD_FOCUS, EventType.FIELD_BLUR]:
-                field = event.get('field_id', '')
-                duration = event.get('metadata', {}).get('duration', 0)
-                
-                if field and duration > 0:
-                    field_times[field].append(duration)
-        
         bottlenecks = []
-        for field, times in field_times.items():
+        for field_id, times in acc.field_times.items():
             avg_ms = sum(times) / len(times)
             avg_seconds = avg_ms / 1000
             
             if avg_seconds > 15:  # More than 15 seconds = bottleneck
                 severity = 'high' if avg_seconds > 45 else 'medium'
                 bottlenecks.append({
-                    'field': field,
+                    'field': field_id,
                     'avg_time_seconds': round(avg_seconds, 1),
                     'sample_count': len(times),
                     'severity': severity
                 })
         
-        return sorted(bottlenecks, key=lambda x: x['avg_time_seconds'], reverse=True)[:10]
+        return heapq.nlargest(10, bottlenecks, key=lambda x: x['avg_time_seconds'])
     
-    def _identify_errors(self, events: List[Dict]) -> List[Dict]:
+    def _identify_errors(self, acc: "_InsightsAccumulator") -> List[Dict]:
         """Find most common validation errors."""
-        errors: Dict[str, int] = defaultdict(int)
-        
-        for event in events:
-            if event['type'] == EventType.FIELD_ERROR:
-                field = event.get('field_id', 'unknown')
-                error_msg = event.get('metadata', {}).get('error', 'Unknown error')
-                
-                key = f"{field}:{error_msg}"
-                errors[key] += 1
-        
         error_list = [
-            {
-                'field': k.split(':')[0],
-                'error': k.split(':', 1)[1] if ':' in k else k,
-                'count': v
-            }
-            for k, v in errors.items()
+            {'field': field_id, 'error': error_msg, 'count': count}
+            for (field_id, error_msg), count in acc.errors.items()
         ]
         
-        return sorted(error_list, key=lambda x: x['count'], reverse=True)[:10]
+        return heapq.nlargest(10, error_list, key=lambda x: x['count'])
     
-    def _identify_dropouts(self, events: List[Dict]) -> List[Dict]:
+    def _identify_dropouts(self, acc: "_InsightsAccumulator") -> List[Dict]:
         """Identify where users abandon the form."""
-        # Track last field before abandon
-        session_last_field: Dict[str, str] = {}
-        abandonments: Dict[str, int] = defaultdict(int)
-        
-        for event in events:
-            sid = event.get('session_id', '')
-            etype = event['type']
-            
-            if etype == EventType.FIELD_FOCUS:
-                session_last_field[sid] = event.get('field_id', '')
-            elif etype == EventType.FORM_ABANDON:
-                last_field = session_last_field.get(sid, 'unknown')
-                abandonments[last_field] += 1
-        
         dropout_list = [
-            {'field': field, 'dropout_count': count}
-            for field, count in abandonments.items()
+            {'field': field_id, 'dropout_count': count}
+            for field_id, count in acc.abandonments.items()
         ]
         
-        return sorted(dropout_list, key=lambda x: x['dropout_count'], reverse=True)[:5]
+        return heapq.nlargest(5, dropout_list, key=lambda x: x['dropout_count'])
     
-    def _calculate_voice_stats(self, events: List[Dict]) -> Dict[str, Any]:
+    def _calculate_voice_stats(self, acc: "_InsightsAccumulator") -> Dict[str, Any]:
         """Calculate voice-specific metrics."""
-        voice_sessions = 0
-        voice_errors = 0
-        clarifications_shown = 0
-        suggestions_accepted = 0
-        
-        for event in events:
-            etype = event['type']
-            
-            if etype == EventType.VOICE_START:
-                voice_sessions += 1
-            elif etype == EventType.VOICE_ERROR:
-                voice_errors += 1
-            elif etype == EventType.CLARIFICATION_SHOWN:
-                clarifications_shown += 1
-            elif etype == EventType.SUGGESTION_ACCEPTED:
-                suggestions_accepted += 1
+        voice_sessions = acc.voice_sessions
+        clarifications_shown = acc.clarifications_shown
         
         return {
             'voice_sessions': voice_sessions,
-            'voice_error_rate': round(voice_errors / voice_sessions, 3) if voice_sessions > 0 else 0,
+            'voice_error_rate': round(acc.voice_errors / voice_sessions, 3) if voice_sessions > 0 else 0,
             'clarification_rate': round(clarifications_shown / voice_sessions, 3) if voice_sessions > 0 else 0,
             'suggestion_acceptance_rate': round(
-                suggestions_accepted / clarifications_shown, 3
+                acc.suggestions_accepted / clarifications_shown, 3
             ) if clarifications_shown > 0 else 0
         }
     
-    def _generate_recommendations(self, events: List[Dict]) -> List[Dict]:
+    def _generate_recommendations(
+        self,
+        bottlenecks: List[Dict],
+        errors: List[Dict],
+        dropouts: List[Dict]
+    ) -> List[Dict]:
         """Generate AI-powered recommendations."""
         recommendations = []
         
-        bottlenecks = self._identify_bottlenecks(events)
-        errors = self._identify_errors(events)
-        dropouts = self._identify_dropouts(events)
-        
         # Bottleneck recommendations
         for bottleneck in bottlenecks[:3]:
             recommendations.append({
@@ -375,8 +441,10 @@ class FormAnalytics:
         return recommendations
     
     def _hash_id(self, user_id: str) -> str:
-        """Hash user ID for privacy."""
-        return hashlib.sha256(user_id.encode()).hexdigest()[:16]
+        """Hash user ID for privacy (keyed, so IDs can't be looked up by brute force)."""
+        return hashlib.blake2b(
+            str(user_id).encode("utf-8"), digest_size=8, key=_ANALYTICS_SALT
+        ).hexdigest()
 
 
 # Singleton instance
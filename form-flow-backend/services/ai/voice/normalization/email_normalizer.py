@@ -17,6 +17,9 @@ from services.ai.voice.config import (
 )
 
 
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 class EmailNormalizer(BaseNormalizer):
     """
     Normalize email addresses from voice input.
@@ -137,8 +140,7 @@ class EmailNormalizer(BaseNormalizer):
             return False, 0.0
         
         # Basic email pattern
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        is_valid = bool(re.match(pattern, email))
+        is_valid = bool(_EMAIL_RE.match(email))
         
         if not is_valid:
             return False, 0.3
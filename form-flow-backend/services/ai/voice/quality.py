@@ -12,6 +12,8 @@ from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 class FieldImportance(Enum):
     """Importance levels for field accuracy."""
@@ -164,8 +166,7 @@ class ConfidenceCalibrator:
     @classmethod
     def _is_valid_email(cls, email: str) -> bool:
         """Validate email format."""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
     
     @classmethod
     def _is_valid_phone(cls, phone: str) -> bool:
@@ -1,2 +1,2 @@
 # Docx Service Module
-from .docx_parser import DocxParser, parse_docx_fields
+from .docx_parser import DocxParser, parse_docx_fields, check_docx_archive
@@ -11,6 +11,7 @@ Supports:
 import re
 import io
 import uuid
+import zipfile
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -23,6 +24,50 @@ from utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+# Archive limits checked before python-docx inflates anything
+MAX_ARCHIVE_MEMBERS = 1000
+MAX_MEMBER_SIZE = 50 * 1024 * 1024
+MAX_TOTAL_UNCOMPRESSED = 200 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 200
+# Small members can legitimately compress extremely well (repetitive XML)
+RATIO_CHECK_MIN_SIZE = 1024 * 1024
+
+
+def check_docx_archive(file_source) -> Optional[str]:
+    """
+    Reject zip bombs by inspecting the central directory only.
+    
+    Args:
+        file_source: File path or binary stream
+        
+    Returns:
+        Reason the archive is rejected, or None if it looks safe
+    """
+    try:
+        with zipfile.ZipFile(file_source) as archive:
+            members = archive.infolist()
+    except (zipfile.BadZipFile, OSError):
+        return "File is not a valid .docx document"
+    
+    if len(members) > MAX_ARCHIVE_MEMBERS:
+        return f"Document contains too many parts ({len(members)})"
+    
+    total = 0
+    for info in members:
+        if info.file_size > MAX_MEMBER_SIZE:
+            return f"Document part '{info.filename}' is too large"
+        if (
+            info.file_size > RATIO_CHECK_MIN_SIZE
+            and info.file_size / max(info.compress_size, 1) > MAX_COMPRESSION_RATIO
+        ):
+            return f"Document part '{info.filename}' has a suspicious compression ratio"
+        total += info.file_size
+    
+    if total > MAX_TOTAL_UNCOMPRESSED:
+        return "Document is too large when uncompressed"
+    return None
+
+
 @dataclass
 class DocxField:
     """Represents a detected placeholder in a Word document."""
@@ -48,6 +93,8 @@ class DocxParser:
     # Common placeholder patterns
     BRACKET_PATTERN = re.compile(r'\[([A-Za-z][A-Za-z0-9_\s]{1,50})\]')
     UNDERSCORE_PATTERN = re.compile(r'_{3,}')  # 3+ underscores
+    # Label followed by underscores, e.g. "Name: ____" or "Email _______"
+    LABEL_UNDERSCORE_PATTERN = re.compile(r'([A-Za-z][A-Za-z\s]{1,30})[:\s]*_{3,}')
     
     # Field type inference from name
     FIELD_TYPE_MAP = {
@@ -189,10 +236,7 @@ class DocxParser:
             text = paragraph.text
             
             # Look for labels followed by underscores
-            # e.g., "Name: ____" or "Email _______"
-            label_underscore_pattern = re.compile(r'([A-Za-z][A-Za-z\s]{1,30})[:\s]*_{3,}')
-            
-            for match in label_underscore_pattern.finditer(text):
+            for match in self.LABEL_UNDERSCORE_PATTERN.finditer(text):
                 label = match.group(1).strip()
                 sanitized = self._sanitize_name(label)
                 
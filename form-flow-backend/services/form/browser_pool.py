@@ -22,11 +22,16 @@ For parser/submitter with custom options:
     ) as context:
         page = await context.new_page()
         ...
+
+Read-only scraping that needs cross-origin iframe access passes
+scrape=True, which hands out a context from a separate browser launched
+with SCRAPE_BROWSER_ARGS. Form submission must never use it.
 """
 
 import asyncio
 import os
-from typing import Optional, Dict, List
+import re
+from typing import Optional, Dict, Iterable
 from contextlib import asynccontextmanager
 
 from utils.logging import get_logger
@@ -37,8 +42,9 @@ logger = get_logger(__name__)
 # Browser Pool Configuration
 # =============================================================================
 
-# Singleton browser instance (shared across requests)
-_browser = None
+# Browser instances (shared across requests), keyed by profile:
+# False -> default hardened browser, True -> scrape-only browser
+_browsers: Dict[bool, object] = {}
 _playwright = None
 _browser_lock = asyncio.Lock()
 
@@ -92,41 +98,63 @@ BROWSER_ARGS = [
     '--disable-http2',
 ]
 
+# Scrape-only browser: cross-origin iframe access for form extraction.
+# These turn off the same-origin policy and site isolation, so they are
+# launched in a separate browser that never fills or submits user data.
+SCRAPE_BROWSER_ARGS = BROWSER_ARGS + [
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--window-size=1920,1080',
+]
+
+# Analytics/ad hosts that never contribute form fields
+TRACKER_HOSTS_RE = re.compile(
+    r"googletagmanager\.com|google-analytics\.com|doubleclick\.net|"
+    r"facebook\.net|hotjar\.com"
+)
+
 
-async def _get_browser(headless: bool = True):
+def _is_connected(browser) -> bool:
+    """Whether a pooled browser is still usable."""
+    try:
+        return browser is not None and browser.is_connected()
+    except Exception:
+        return False
+
+
+async def _get_browser(headless: bool = True, scrape: bool = False):
     """
-    Get or create the shared browser instance.
+    Get or create the shared browser instance for a profile.
     
     Uses a lock to prevent multiple simultaneous browser launches.
     Will relaunch if browser becomes disconnected.
     """
-    global _browser, _playwright
+    global _playwright
     
     async with _browser_lock:
+        browser = _browsers.get(scrape)
+        
         # Force reconnection if browser is disconnected
-        if _browser is not None:
-            try:
-                if not _browser.is_connected():
-                    logger.warning("Browser disconnected, relaunching...")
-                    _browser = None
-            except Exception:
-                _browser = None
+        if browser is not None and not _is_connected(browser):
+            logger.warning("Browser disconnected, relaunching...")
+            browser = None
         
-        if _browser is None:
-            logger.info("🌐 Launching shared browser instance...")
+        if browser is None:
+            logger.info(f"🌐 Launching shared {'scrape ' if scrape else ''}browser instance...")
             
             from playwright.async_api import async_playwright
             
             if _playwright is None:
                 _playwright = await async_playwright().start()
             
-            _browser = await _playwright.chromium.launch(
+            browser = await _playwright.chromium.launch(
                 headless=headless,
-                args=BROWSER_ARGS
+                args=SCRAPE_BROWSER_ARGS if scrape else BROWSER_ARGS
             )
+            _browsers[scrape] = browser
             logger.info("✅ Browser launched and ready")
         
-        return _browser
+        return browser
 
 
 @asynccontextmanager
@@ -134,9 +162,11 @@ async def get_browser_context(
     viewport: Optional[Dict[str, int]] = None,
     user_agent: Optional[str] = None,
     stealth_script: Optional[str] = None,
-    block_resources: Optional[List[str]] = None,
+    block_resources: Optional[Iterable[str]] = None,
+    block_trackers: bool = False,
     locale: str = "en-US",
     headless: bool = True,
+    scrape: bool = False,
 ):
     """
     Get a browser context from the pool with optional customization.
@@ -144,9 +174,13 @@ async def get_browser_context(
     Each context is isolated (like incognito) but shares the browser instance.
     Memory usage: ~50MB per context vs ~300MB per browser.
     
+    scrape=True selects the scrape-only browser (web security and site
+    isolation disabled). Launch flags cannot be set per context, so this
+    picks a different browser rather than changing the context.
+    
     ROBUST: Will retry context creation if browser crashes during the operation.
     """
-    global _active_contexts, _browser, _playwright
+    global _active_contexts, _playwright
     
     semaphore = _get_semaphore()
     context = None
@@ -168,7 +202,7 @@ async def get_browser_context(
         
         for attempt in range(max_retries):
             try:
-                browser = await _get_browser(headless=headless)
+                browser = await _get_browser(headless=headless, scrape=scrape)
                 
                 # Create context - this is where crashes often happen
                 context = await browser.new_context(
@@ -182,11 +216,19 @@ async def get_browser_context(
                     await context.add_init_script(stealth_script)
                 
                 # Set up resource blocking at context level
-                if block_resources:
-                    await context.route(
-                        "**/*", 
-                        lambda route: route.abort() if route.request.resource_type in set(block_resources) else route.continue_()
-                    )
+                if block_resources or block_trackers:
+                    blocked_types = frozenset(block_resources or ())
+                    
+                    async def _block(route):
+                        request = route.request
+                        if request.resource_type in blocked_types or (
+                            block_trackers and TRACKER_HOSTS_RE.search(request.url)
+                        ):
+                            await route.abort()
+                        else:
+                            await route.continue_()
+                    
+                    await context.route("**/*", _block)
                 
                 # Success - break out of retry loop
                 break
@@ -201,18 +243,21 @@ async def get_browser_context(
                     # Force browser restart
                     async with _browser_lock:
                         try:
-                            if _browser:
-                                await _browser.close()
+                            crashed = _browsers.pop(scrape, None)
+                            if crashed:
+                                await crashed.close()
                         except:
                             pass
-                        _browser = None
                         
-                        try:
-                            if _playwright:
-                                await _playwright.stop()
-                        except:
-                            pass
-                        _playwright = None
+                        # Keep the driver while the other profile is still alive
+                        if not any(_is_connected(b) for b in _browsers.values()):
+                            _browsers.clear()
+                            try:
+                                if _playwright:
+                                    await _playwright.stop()
+                            except:
+                                pass
+                            _playwright = None
                     
                     # Small delay before retry
                     await asyncio.sleep(1)
@@ -241,15 +286,16 @@ async def close_browser_pool():
     
     Called on application shutdown.
     """
-    global _browser, _playwright
+    global _playwright
     
-    if _browser:
+    for browser in list(_browsers.values()):
         try:
-            await _browser.close()
-            logger.info("Browser pool closed")
+            await browser.close()
         except Exception:
             pass
-        _browser = None
+    if _browsers:
+        _browsers.clear()
+        logger.info("Browser pool closed")
     
     if _playwright:
         try:
@@ -262,7 +308,8 @@ async def close_browser_pool():
 def get_pool_status() -> dict:
     """Get current browser pool status."""
     return {
-        "browser_running": _browser is not None and _browser.is_connected() if _browser else False,
+        "browser_running": _is_connected(_browsers.get(False)),
+        "scrape_browser_running": _is_connected(_browsers.get(True)),
         "active_contexts": _active_contexts,
         "max_contexts": MAX_CONTEXTS,
     }
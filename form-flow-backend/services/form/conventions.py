@@ -7,9 +7,21 @@ Decouples voice processing from form validation logic.
 
 from typing import Dict, List, Any, Callable, Tuple, Optional
 from dataclasses import dataclass, field
+from functools import lru_cache
 import re
 
 
+_SPECIAL_CHAR_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_EMAIL_FORMAT_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+@lru_cache(maxsize=512)
+def _compiled(pattern: str) -> re.Pattern:
+    """Compile a scraped pattern once; the same patterns recur across schemas."""
+    return re.compile(pattern)
+
+
 # === Reusable Formatters ===
 
 def strip_whitespace(value: str) -> str:
@@ -31,14 +43,14 @@ def normalize_email(value: str) -> str:
 def strengthen_password(value: str) -> str:
     """Add missing special characters and uppercase to password"""
     # Add special character if missing
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', value):
+    if not _SPECIAL_CHAR_RE.search(value):
         if ' ' in value:
             value = value.replace(' ', '@', 1)
         else:
             value = value + '@'
     
     # Add uppercase if missing - capitalize first letter
-    if not re.search(r'[A-Z]', value):
+    if not _UPPERCASE_RE.search(value):
         value = value[0].upper() + value[1:] if value else value
     
     return value
@@ -58,8 +70,7 @@ def lowercase(value: str) -> str:
 
 def validate_email_format(value: str) -> Tuple[bool, str]:
     """Check if email has valid format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if re.match(pattern, value):
+    if _EMAIL_FORMAT_RE.match(value):
         return True, ""
     return False, "Invalid email format (must be like user@domain.com)"
 
@@ -70,9 +81,9 @@ def validate_password_strength(value: str) -> Tuple[bool, str]:
     
     if len(value) < 8:
         errors.append("at least 8 characters")
-    if not re.search(r'[A-Z]', value):
+    if not _UPPERCASE_RE.search(value):
         errors.append("one uppercase letter")
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', value):
+    if not _SPECIAL_CHAR_RE.search(value):
         errors.append("one special character")
     
     if errors:
@@ -83,7 +94,7 @@ def validate_password_strength(value: str) -> Tuple[bool, str]:
 def create_pattern_validator(pattern: str) -> Callable:
     """Create a validator from a regex pattern"""
     def validator(value: str) -> Tuple[bool, str]:
-        if re.match(pattern, value):
+        if _compiled(pattern).match(value):
             return True, ""
         return False, f"Value must match pattern: {pattern}"
     return validator
@@ -7,6 +7,18 @@ import asyncio
 from typing import Dict, List, Any
 
 
+# Option counts for several selects in one round-trip; names are passed as
+# an argument so the script text stays constant across calls
+SELECT_OPTION_COUNTS_JS = """
+    (names) => Object.fromEntries(names.map(name => {
+        const sel = document.querySelector(
+            `select[name="${CSS.escape(name)}"], select#${CSS.escape(name)}`
+        );
+        return [name, sel ? sel.options.length : 0];
+    }))
+"""
+
+
 async def map_conditional_fields(page, forms_data: List[Dict]) -> Dict[str, List[Dict]]:
     """
     Map conditional field dependencies (if field X = Y, show field Z).
@@ -170,15 +182,7 @@ async def detect_chained_selects(page, forms_data: List[Dict]) -> List[Dict]:
                 
                 # Get other select elements' option counts before change
                 other_selects = [d['name'] for d in dropdowns[i+1:i+3]]  # Check next 2
-                before_counts = {}
-                for other_name in other_selects:
-                    count = await page.evaluate(f"""
-                        () => {{
-                            const sel = document.querySelector('select[name="{other_name}"], select#{other_name}');
-                            return sel ? sel.options.length : 0;
-                        }}
-                    """)
-                    before_counts[other_name] = count
+                before_counts = await page.evaluate(SELECT_OPTION_COUNTS_JS, other_selects)
                 
                 # Select a different option
                 test_option = options[1]['value'] if len(options) > 1 else options[0]['value']
@@ -187,16 +191,11 @@ async def detect_chained_selects(page, forms_data: List[Dict]) -> List[Dict]:
                     await asyncio.sleep(0.5)
                     
                     # Check if other selects' options changed
-                    dependent_fields = []
-                    for other_name in other_selects:
-                        after_count = await page.evaluate(f"""
-                            () => {{
-                                const sel = document.querySelector('select[name="{other_name}"], select#{other_name}');
-                                return sel ? sel.options.length : 0;
-                            }}
-                        """)
-                        if after_count != before_counts[other_name]:
-                            dependent_fields.append(other_name)
+                    after_counts = await page.evaluate(SELECT_OPTION_COUNTS_JS, other_selects)
+                    dependent_fields = [
+                        name for name in other_selects
+                        if after_counts.get(name) != before_counts.get(name)
+                    ]
                     
                     if dependent_fields:
                         field['dependentFields'] = dependent_fields
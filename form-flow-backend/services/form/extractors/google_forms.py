@@ -4,6 +4,7 @@ Specialized extraction for Google Forms with robust selectors.
 """
 
 import asyncio
+import json
 from typing import List, Dict
 
 
@@ -14,22 +15,36 @@ async def wait_for_google_form(page):
         await page.wait_for_selector('.Qr7Oae, [role="listitem"], .freebirdFormviewerViewItemsItemItem', timeout=30000)
         await asyncio.sleep(3)
         
-        # Scroll to load lazy content
+        # Scroll to the bottom to trigger lazy content and keep following the
+        # page as it grows, until the DOM has been quiet for 400ms (capped at
+        # 5s) so late-rendered questions are attached before extraction
         await page.evaluate("""
             async () => {
-                let total = 0;
-                const timer = setInterval(() => {
-                    window.scrollBy(0, 200);
-                    total += 200;
-                    if (total >= document.body.scrollHeight) {
-                        clearInterval(timer);
-                        window.scrollTo(0, 0);
-                    }
-                }, 100);
-                await new Promise(r => setTimeout(r, 2000));
+                const QUIET_MS = 400, MAX_WAIT_MS = 5000;
+                await new Promise(resolve => {
+                    let quietTimer;
+                    const observer = new MutationObserver(() => {
+                        window.scrollTo(0, document.body.scrollHeight);
+                        settle();
+                    });
+                    const done = () => {
+                        observer.disconnect();
+                        clearTimeout(quietTimer);
+                        clearTimeout(capTimer);
+                        resolve();
+                    };
+                    const settle = () => {
+                        clearTimeout(quietTimer);
+                        quietTimer = setTimeout(done, QUIET_MS);
+                    };
+                    const capTimer = setTimeout(done, MAX_WAIT_MS);
+                    observer.observe(document.body, { childList: true, subtree: true });
+                    window.scrollTo(0, document.body.scrollHeight);
+                    settle();
+                });
+                window.scrollTo(0, 0);
             }
         """)
-        await asyncio.sleep(1)
     except:
         print("⚠️ Timeout waiting for form elements - attempting extraction anyway")
 
@@ -37,7 +52,18 @@ async def wait_for_google_form(page):
 # Google Forms extraction JavaScript
 GOOGLE_FORMS_JS = r'''
 () => {
-    const getText = el => el ? (el.innerText || el.textContent || '').trim() : '';
+    // Option fallbacks often land on the same container/parent element, so
+    // memoize rendered text per element instead of re-walking its subtree
+    const textCache = new WeakMap();
+    const getText = el => {
+        if (!el) return '';
+        let text = textCache.get(el);
+        if (text === undefined) {
+            text = (el.innerText || el.textContent || '').trim();
+            textCache.set(el, text);
+        }
+        return text;
+    };
     
     const titleEl = document.querySelector('[role="heading"], .freebirdFormviewerViewHeaderTitle, h1');
     const formTitle = getText(titleEl);
@@ -55,7 +81,11 @@ GOOGLE_FORMS_JS = r'''
     
     console.log(`Found ${questions.length} question containers`);
     
-    questions.forEach((q, idx) => {
+    // Single selector union instead of one DOM query per date marker
+    const DATE_MARKERS = '[data-date], [aria-label*="Day"], [aria-label*="Month"], [aria-label*="Year"], .qLWDgb';
+    
+    for (let idx = 0, n = questions.length; idx < n; idx++) {
+        const q = questions[idx];
         let label = '';
         
         // Method 1: Title span
@@ -63,7 +93,9 @@ GOOGLE_FORMS_JS = r'''
         if (titleSpan) {
             const clone = titleSpan.cloneNode(true);
             clone.querySelectorAll('[role="radio"], [role="checkbox"], .docssharedWizToggleLabeledContainer, input').forEach(el => el.remove());
-            label = getText(clone);
+            // Detached clones are never rendered, so innerText would fall
+            // back to textContent anyway
+            label = (clone.textContent || '').trim();
         }
         
         // Method 2: data-params
@@ -96,18 +128,23 @@ GOOGLE_FORMS_JS = r'''
         label = label.replace(/\*$/, '').replace(/\s*\(Required\)\s*/gi, '').trim();
         if (!label) label = `Question ${idx + 1}`;
         
-        const required = q.innerHTML.includes('*') || 
+        // Serializing innerHTML is costly; do it once per question
+        const html = q.innerHTML;
+        const required = html.includes('*') || 
                         q.querySelector('[aria-label*="Required"]') !== null ||
-                        q.innerHTML.includes('required');
+                        html.includes('required');
         
-        const radioInputs = q.querySelectorAll('[role="radio"]');
-        const checkboxInputs = q.querySelectorAll('[role="checkbox"]');
+        // One subtree walk for both choice roles, split by role afterwards
+        const radioInputs = [];
+        const checkboxInputs = [];
+        for (const el of q.querySelectorAll('[role="radio"], [role="checkbox"]')) {
+            (el.getAttribute('role') === 'radio' ? radioInputs : checkboxInputs).push(el);
+        }
         const selectEl = q.querySelector('select, [role="listbox"]');
         
-        const isDateQuestion = label.toLowerCase().includes('date') ||
-                              q.querySelector('[data-date]') !== null ||
-                              q.querySelector('[aria-label*="Day"], [aria-label*="Month"], [aria-label*="Year"]') !== null ||
-                              q.querySelector('.qLWDgb') !== null;
+        const labelLower = label.toLowerCase();
+        const isDateQuestion = labelLower.includes('date') ||
+                              q.querySelector(DATE_MARKERS) !== null;
         
         const textInput = q.querySelector('input.whsOnd, input[type="text"], input[type="email"]');
         const textArea = q.querySelector('textarea.KHxj8b, textarea');
@@ -116,15 +153,15 @@ GOOGLE_FORMS_JS = r'''
         let field = null;
         
         const isEmail = textInput?.getAttribute('aria-label')?.toLowerCase().includes('email') ||
-                       label.toLowerCase().includes('email');
+                       labelLower.includes('email');
         
         if (radioInputs.length > 0) {
-            const options = Array.from(radioInputs).map((r, i) => {
+            const options = radioInputs.map((r, i) => {
                 let optionLabel = r.getAttribute('aria-label') || '';
                 if (!optionLabel) optionLabel = r.getAttribute('data-value') || '';
                 if (!optionLabel) {
                     const labelSpan = r.querySelector('span') || r.closest('[role="presentation"]')?.querySelector('span');
-                    optionLabel = labelSpan ? getText(labelSpan) : '';
+                    optionLabel = getText(labelSpan);
                 }
                 if (!optionLabel && r.nextElementSibling) {
                     optionLabel = getText(r.nextElementSibling);
@@ -139,7 +176,7 @@ GOOGLE_FORMS_JS = r'''
             field = { name: `radio_${idx}`, type: 'radio', tagName: 'radio-group', options };
             
         } else if (checkboxInputs.length > 0) {
-            const options = Array.from(checkboxInputs).map((c, i) => {
+            const options = checkboxInputs.map((c, i) => {
                 let optionLabel = c.getAttribute('aria-label') || '';
                 if (!optionLabel) optionLabel = c.getAttribute('data-value') || '';
                 if (!optionLabel) {
@@ -155,10 +192,10 @@ GOOGLE_FORMS_JS = r'''
         } else if (selectEl) {
             const options = selectEl.tagName === 'SELECT' 
                 ? Array.from(selectEl.options).map(o => ({value: o.value, label: o.text}))
-                : Array.from(q.querySelectorAll('[role="option"], [data-value]')).map(o => ({
-                    value: o.getAttribute('data-value') || getText(o),
-                    label: getText(o)
-                }));
+                : Array.from(q.querySelectorAll('[role="option"], [data-value]')).map(o => {
+                    const text = getText(o);
+                    return { value: o.getAttribute('data-value') || text, label: text };
+                });
             field = { name: selectEl.name || `dropdown_${idx}`, type: 'dropdown', tagName: 'select', options };
             
         } else if (isDateQuestion) {
@@ -198,10 +235,10 @@ GOOGLE_FORMS_JS = r'''
             field.hidden = false;
             form.fields.push(field);
         }
-    });
+    }
     
     console.log(`Total fields extracted: ${form.fields.length}`);
-    return form.fields.length > 0 ? [form] : [];
+    return JSON.stringify(form.fields.length > 0 ? [form] : []);
 }
 '''
 
@@ -209,4 +246,4 @@ GOOGLE_FORMS_JS = r'''
 async def extract_google_forms(page) -> List[Dict]:
     """Specialized Google Forms extraction with robust selectors."""
     print("🔍 Extracting Google Form...")
-    return await page.evaluate(GOOGLE_FORMS_JS)
+    return json.loads(await page.evaluate(GOOGLE_FORMS_JS))
@@ -3,12 +3,15 @@ Standard Forms Extractor
 Extracts fields from standard HTML forms with radio/checkbox grouping.
 """
 
+import json
 from typing import List, Dict
 
 
 # The main extraction JavaScript - handles custom dropdowns, radio groups, checkboxes
 STANDARD_FORMS_JS = '''
 () => {
+    // innerText, not textContent: label text (fed to the LLM and speech
+    // prompts) must skip hidden spans and <script>/<style> contents
     const getText = el => el ? (el.innerText || el.textContent || '').trim() : '';
     const isVisible = el => {
         if (!el) return false;
@@ -16,10 +19,44 @@ STANDARD_FORMS_JS = '''
         return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0' && el.getBoundingClientRect().height > 0;
     };
     
+    // label[for] lookups go through a per-form index built on first use,
+    // so each field/option doesn't rescan the whole form
+    const labelIndexes = new Map();
+    const getLabelFor = (form, id) => {
+        let index = labelIndexes.get(form);
+        if (!index) {
+            index = new Map();
+            form.querySelectorAll('label[for]').forEach(lbl => {
+                const target = lbl.getAttribute('for');
+                if (!index.has(target)) index.set(target, lbl);
+            });
+            labelIndexes.set(form, index);
+        }
+        return index.get(id) || null;
+    };
+    
+    // Text blocks usable as visual-proximity labels, read once per form.
+    // Extraction never mutates the DOM, so rects stay valid for every field.
+    const proximityCandidates = new Map();
+    const getProximityCandidates = form => {
+        let list = proximityCandidates.get(form);
+        if (!list) {
+            list = [];
+            form.querySelectorAll('label, span, p, div, h1, h2, h3, h4, h5, h6, td, th').forEach(el => {
+                if (el.querySelector('input, select, textarea')) return;
+                const text = getText(el);
+                if (!text || text.length > 100 || text.length < 2) return;
+                list.push({ text, rect: el.getBoundingClientRect() });
+            });
+            proximityCandidates.set(form, list);
+        }
+        return list;
+    };
+    
     const findLabel = (field, form) => {
         // Strategy 1: Explicit label[for] association
         if (field.id) {
-            const lbl = form.querySelector(`label[for="${field.id}"]`);
+            const lbl = getLabelFor(form, field.id);
             if (lbl) return getText(lbl);
         }
         
@@ -68,13 +105,7 @@ STANDARD_FORMS_JS = '''
             const fieldRect = field.getBoundingClientRect();
             const candidates = [];
             
-            form.querySelectorAll('label, span, p, div, h1, h2, h3, h4, h5, h6, td, th').forEach(el => {
-                if (el.querySelector('input, select, textarea')) return;
-                const text = getText(el);
-                if (!text || text.length > 100 || text.length < 2) return;
-                
-                const elRect = el.getBoundingClientRect();
-                
+            getProximityCandidates(form).forEach(({ text, rect: elRect }) => {
                 const isAbove = elRect.bottom <= fieldRect.top && 
                                elRect.bottom > fieldRect.top - 60 &&
                                Math.abs(elRect.left - fieldRect.left) < 100;
@@ -88,7 +119,7 @@ STANDARD_FORMS_JS = '''
                         (elRect.right - fieldRect.left),
                         (elRect.bottom - fieldRect.top)
                     );
-                    candidates.push({ el, text, distance, isAbove, isLeft });
+                    candidates.push({ text, distance, isAbove, isLeft });
                 }
             });
             
@@ -159,12 +190,23 @@ STANDARD_FORMS_JS = '''
         return name.replace(/[_-]/g, ' ').replace(/([a-z])([A-Z])/g, '$1 $2').replace(/\\[\\]/g, '').trim();
     };
 
-    return Array.from(document.querySelectorAll('form')).map((form, idx) => {
+    const forms = Array.from(document.querySelectorAll('form')).map((form, idx) => {
         const fields = [];
         const processedRadioGroups = new Set();
         const processedCheckboxGroups = new Set();
         const skippedCustomDropdownInputs = new Set();
         
+        // Group radios and checkboxes by name in a single form scan instead
+        // of one attribute-selector query per field
+        const radiosByName = new Map();
+        const checkboxesByName = new Map();
+        form.querySelectorAll('input[type="radio"], input[type="checkbox"]').forEach(input => {
+            const groups = input.type === 'radio' ? radiosByName : checkboxesByName;
+            const group = groups.get(input.name);
+            if (group) group.push(input);
+            else groups.set(input.name, [input]);
+        });
+        
         // Custom dropdown selectors
         const customDropdownSelectors = [
             '.ant-select',
@@ -200,7 +242,7 @@ STANDARD_FORMS_JS = '''
             let label = '';
             const inputId = innerInput?.id || combobox?.id;
             if (inputId) {
-                const lbl = form.querySelector(`label[for="${inputId}"]`);
+                const lbl = getLabelFor(form, inputId);
                 if (lbl) label = getText(lbl);
             }
             
@@ -245,30 +287,34 @@ STANDARD_FORMS_JS = '''
         });
         
         // Process standard inputs
-        Array.from(form.querySelectorAll('input, select, textarea')).forEach(field => {
+        // Plain indexed loop over the static NodeList: no Array.from copy
+        // and no per-field callback invocation
+        const inputs = form.querySelectorAll('input, select, textarea');
+        for (let i = 0, n = inputs.length; i < n; i++) {
+            const field = inputs[i];
             const type = field.type || field.tagName.toLowerCase();
             const name = field.name || field.id;
             
-            if (!name || type === 'submit' || type === 'button' || type === 'hidden') return;
-            if (skippedCustomDropdownInputs.has(name)) return;
+            if (!name || type === 'submit' || type === 'button' || type === 'hidden') continue;
+            if (skippedCustomDropdownInputs.has(name)) continue;
             
             // Only skip internal search inputs inside custom select components
             // Don't skip regular text/email/tel inputs that might be siblings
             if (type === 'search' && field.closest('.ant-select, .select2-container, .choices, [class*="select-"][class*="container"]')) {
                 // This is the internal search box of a custom dropdown - skip it
-                return;
+                continue;
             }
             
             // RADIO BUTTONS
             if (type === 'radio') {
-                if (processedRadioGroups.has(name)) return;
+                if (processedRadioGroups.has(name)) continue;
                 processedRadioGroups.add(name);
                 
-                const radios = Array.from(form.querySelectorAll(`input[type="radio"][name="${name}"]`));
+                const radios = radiosByName.get(name) || [];
                 const options = radios.map(r => {
                     let optLabel = r.getAttribute('aria-label') || '';
                     if (!optLabel && r.id) {
-                        const lbl = form.querySelector(`label[for="${r.id}"]`);
+                        const lbl = getLabelFor(form, r.id);
                         if (lbl) optLabel = getText(lbl);
                     }
                     if (!optLabel) {
@@ -292,21 +338,21 @@ STANDARD_FORMS_JS = '''
                     hidden: !radios.some(r => isVisible(r)),
                     options: options
                 });
-                return;
+                continue;
             }
             
             // CHECKBOXES
             if (type === 'checkbox') {
-                const checkboxes = Array.from(form.querySelectorAll(`input[type="checkbox"][name="${name}"]`));
+                const checkboxes = checkboxesByName.get(name) || [];
                 
                 if (checkboxes.length > 1) {
-                    if (processedCheckboxGroups.has(name)) return;
+                    if (processedCheckboxGroups.has(name)) continue;
                     processedCheckboxGroups.add(name);
                     
                     const options = checkboxes.map(c => {
                         let optLabel = c.getAttribute('aria-label') || '';
                         if (!optLabel && c.id) {
-                            const lbl = form.querySelector(`label[for="${c.id}"]`);
+                            const lbl = getLabelFor(form, c.id);
                             if (lbl) optLabel = getText(lbl);
                         }
                         if (!optLabel) {
@@ -339,11 +385,17 @@ STANDARD_FORMS_JS = '''
                         checked: field.checked
                     });
                 }
-                return;
+                continue;
             }
             
             // SELECT dropdowns
             if (field.tagName === 'SELECT') {
+                // Single pass over the options collection (includes optgroup
+                // children) instead of Array.from + filter + map copies
+                const options = [];
+                for (const o of field.options) {
+                    if (o.value) options.push({ value: o.value, label: o.text.trim(), selected: o.selected });
+                }
                 fields.push({
                     name: name,
                     type: 'dropdown',
@@ -351,13 +403,9 @@ STANDARD_FORMS_JS = '''
                     label: findLabel(field, form),
                     required: field.required,
                     hidden: !isVisible(field),
-                    options: Array.from(field.options).filter(o => o.value).map(o => ({
-                        value: o.value,
-                        label: o.text.trim(),
-                        selected: o.selected
-                    }))
+                    options: options
                 });
-                return;
+                continue;
             }
             
             // Standard text/email/etc inputs
@@ -373,7 +421,7 @@ STANDARD_FORMS_JS = '''
                 disabled: field.disabled,
                 readonly: field.readOnly
             });
-        });
+        }
         
         return {
             formIndex: idx,
@@ -384,10 +432,13 @@ STANDARD_FORMS_JS = '''
             fields: fields
         };
     }).filter(f => f.fields.length > 0);
+
+    // One string crosses the protocol instead of a per-property object walk
+    return JSON.stringify(forms);
 }
 '''
 
 
 async def extract_standard_forms(frame) -> List[Dict]:
     """Extract forms using JavaScript evaluation - handles radio/checkbox groups properly."""
-    return await frame.evaluate(STANDARD_FORMS_JS)
+    return json.loads(await frame.evaluate(STANDARD_FORMS_JS))
@@ -4,18 +4,30 @@ Scrapes form fields from any URL including Google Forms with iframe support.
 """
 
 from playwright.sync_api import sync_playwright
-from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any
 import asyncio
 from asyncio import TimeoutError
+import copy
+import json
 import re
-import os
 import sys
 
 # Import modular extractors
-from services.form.extractors.standard import extract_standard_forms as _modular_extract_standard
+from services.form.extractors.standard import STANDARD_FORMS_JS, extract_standard_forms as _modular_extract_standard
 from services.form.extractors.google_forms import extract_google_forms as _modular_extract_google, wait_for_google_form as _modular_wait_google
+from services.form.browser_pool import get_browser_context, TRACKER_HOSTS_RE
+from utils.api_cache import cache_form_schema, get_cached_form_schema
+# Template building and validation live in the modular processors;
+# re-exported here for existing callers of the parser module
+from services.form.processors import create_template, validate_field_value
+
+# lxml builds the soup tree in C; html.parser is the pure-Python fallback
+try:
+    import lxml  # noqa: F401
+    SOUP_PARSER = "lxml"
+except ImportError:
+    SOUP_PARSER = "html.parser"
 
 # ============================================================================
 # CONSTANTS
@@ -31,6 +43,10 @@ Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
 window.chrome = { runtime: {}, loadTimes: () => {}, csi: () => {}, app: {} };
 """
 
+# Resource types a scrape never needs. Stylesheets stay: visibility checks
+# and hidden-field detection depend on computed styles.
+BLOCKED_RESOURCE_TYPES = frozenset({"media", "font", "image", "manifest"})
+
 BROWSER_ARGS = [
     "--disable-blink-features=AutomationControlled", "--disable-dev-shm-usage",
     "--no-sandbox", "--disable-setuid-sandbox", "--disable-web-security",
@@ -55,6 +71,27 @@ FIELD_PATTERNS = {
     'message': ['message', 'comment', 'feedback', 'description', 'note'],
 }
 
+# One compiled alternation per purpose, checked in FIELD_PATTERNS order
+_PURPOSE_PATTERNS = tuple(
+    (purpose, re.compile("|".join(map(re.escape, keywords))))
+    for purpose, keywords in FIELD_PATTERNS.items()
+)
+
+_CHECKBOX_TYPES = frozenset({"checkbox", "checkbox-group"})
+_MULTIPLE_CHOICE_TYPES = frozenset({"radio", "radio-group", "mcq"})
+_DROPDOWN_TYPES = frozenset({"select", "dropdown"})
+
+_DISPLAY_NAME_PREFIXES = ('input_', 'field_', 'form_', 'data_', 'entry.')
+
+# Formatting patterns (validation patterns live in processors.enrichment)
+_NON_PHONE_CHARS_RE = re.compile(r'[^\d+]')
+
+# Scraped schemas are reused briefly (retries, UI refreshes, speech regen)
+FORM_SCHEMA_CACHE_TTL = 300
+
+# Concurrent scrapes keyed by (url, generate_speech, wait_for_dynamic)
+_inflight_scrapes: Dict[tuple, "asyncio.Task[Dict[str, Any]]"] = {}
+
 # ============================================================================
 # MAIN EXPORT FUNCTION
 # ============================================================================
@@ -73,13 +110,48 @@ async def get_form_schema(url: str, generate_speech: bool = True, wait_for_dynam
     
     Returns:
         Dict with 'forms', 'url', 'is_google_form', 'total_forms', 'total_fields'
+    
+    Successful scrapes that waited for dynamic content are cached per URL
+    for FORM_SCHEMA_CACHE_TTL seconds (speech is regenerated on a hit), and
+    concurrent calls for the same URL share a single scrape. A
+    wait_for_dynamic=False scrape may be incomplete, so it is never cached.
     """
+    cached = await get_cached_form_schema(url)
+    if cached is not None:
+        result = copy.deepcopy(cached)
+        if generate_speech and result['forms']:
+            result['speech'] = await asyncio.to_thread(_generate_speech, result['forms'])
+        return result
+    
+    key = (url, generate_speech, wait_for_dynamic)
+    task = _inflight_scrapes.get(key)
+    
+    if task is None:
+        task = asyncio.create_task(_scrape_and_cache(url, generate_speech, wait_for_dynamic))
+        _inflight_scrapes[key] = task
+        task.add_done_callback(lambda _: _inflight_scrapes.pop(key, None))
+    
+    # Shield so one client disconnecting does not cancel the shared scrape;
+    # every caller gets its own copy since routers enrich fields in place
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+async def _scrape_and_cache(url: str, generate_speech: bool, wait_for_dynamic: bool) -> Dict[str, Any]:
+    """Run the platform-appropriate scrape and cache a successful result."""
     # On Windows, use sync Playwright to avoid asyncio subprocess issues
     if sys.platform == 'win32':
-        return await asyncio.to_thread(_sync_get_form_schema, url, generate_speech, wait_for_dynamic)
+        result = await asyncio.to_thread(_sync_get_form_schema, url, generate_speech, wait_for_dynamic)
+    else:
+        # Non-Windows: use async Playwright as before
+        result = await _async_get_form_schema(url, generate_speech, wait_for_dynamic)
     
-    # Non-Windows: use async Playwright as before
-    return await _async_get_form_schema(url, generate_speech, wait_for_dynamic)
+    # Speech audio is bytes and depends on TTS config, so it is not cached.
+    # Only complete (dynamic-wait) scrapes may be served to every caller.
+    if wait_for_dynamic and result.get('forms'):
+        schema = {k: v for k, v in result.items() if k != 'speech'}
+        await cache_form_schema(url, schema, ttl=FORM_SCHEMA_CACHE_TTL)
+    
+    return result
 
 
 def _sync_get_form_schema(url: str, generate_speech: bool = True, wait_for_dynamic: bool = True) -> Dict[str, Any]:
@@ -95,9 +167,10 @@ def _sync_get_form_schema(url: str, generate_speech: bool = True, wait_for_dynam
                 locale="en-US"
             )
             context.add_init_script(STEALTH_SCRIPT)
+            # Context-level so the filter covers every page, incl. popups
+            context.route("**/*", _sync_block_route)
             
             page = context.new_page()
-            page.route("**/*", lambda r: r.abort() if r.request.resource_type in {"media", "font"} else r.continue_())
             
             print(f"🔗 Navigating to {'Google Form' if is_google_form else 'page'}...")
             page.goto(url, wait_until="domcontentloaded", timeout=120000)
@@ -115,13 +188,13 @@ def _sync_get_form_schema(url: str, generate_speech: bool = True, wait_for_dynam
             
             print("✓ Page loaded, extracting forms...")
             
-            # Extract forms using sync JS evaluation
-            html_content = page.content()
-            forms_data = _extract_with_beautifulsoup(html_content)
+            # Extract forms in the page with the same modular extractor as the
+            # async path; serializing the whole DOM with page.content() is only
+            # worth it for the BeautifulSoup fallback
+            forms_data = json.loads(page.evaluate(STANDARD_FORMS_JS))
             
-            # Also try the JS extraction
             if not forms_data:
-                forms_data = page.evaluate(_get_standard_extraction_js())
+                forms_data = _extract_with_beautifulsoup(page.content())
             
             print(f"✓ Found {len(forms_data)} form(s)")
             
@@ -151,6 +224,15 @@ def _sync_get_form_schema(url: str, generate_speech: bool = True, wait_for_dynam
         return {'forms': [], 'url': url, 'error': str(e)}
 
 
+def _sync_block_route(route):
+    """Sync route handler mirroring the pool's resource and tracker blocking."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or TRACKER_HOSTS_RE.search(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
 def _sync_wait_for_google_form(page):
     """Sync version of waiting for Google Form content."""
     import time
@@ -164,68 +246,23 @@ def _sync_wait_for_google_form(page):
     time.sleep(3)
 
 
-def _get_standard_extraction_js():
-    """Return the JS code for standard form extraction."""
-    return """
-        () => {
-            const getText = el => el ? (el.innerText || el.textContent || '').trim() : '';
-            
-            return Array.from(document.querySelectorAll('form')).map((form, idx) => {
-                const fields = [];
-                
-                Array.from(form.querySelectorAll('input, select, textarea')).forEach(field => {
-                    const type = field.type || field.tagName.toLowerCase();
-                    const name = field.name || field.id;
-                    
-                    if (!name || type === 'submit' || type === 'button' || type === 'hidden') return;
-                    
-                    if (field.tagName === 'SELECT') {
-                        fields.push({
-                            name: name, type: 'dropdown', tagName: 'select',
-                            label: getText(form.querySelector(`label[for="${field.id}"]`)) || name,
-                            required: field.required,
-                            options: Array.from(field.options).filter(o => o.value).map(o => ({
-                                value: o.value, label: o.text.trim()
-                            }))
-                        });
-                        return;
-                    }
-                    
-                    fields.push({
-                        name: name, type: type, tagName: field.tagName.toLowerCase(),
-                        label: getText(form.querySelector(`label[for="${field.id}"]`)) || field.placeholder || name,
-                        placeholder: field.placeholder || null,
-                        required: field.required
-                    });
-                });
-                
-                return {
-                    formIndex: idx,
-                    action: form.action || null,
-                    method: (form.method || 'GET').toUpperCase(),
-                    fields: fields
-                };
-            }).filter(f => f.fields.length > 0);
-        }
-    """
-
-
 async def _async_get_form_schema(url: str, generate_speech: bool = True, wait_for_dynamic: bool = True) -> Dict[str, Any]:
-    """Original async Playwright implementation for non-Windows platforms."""
+    """Async Playwright implementation for non-Windows platforms, backed by the shared browser pool."""
     is_google_form = 'docs.google.com/forms' in url
     
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False, args=BROWSER_ARGS)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/121.0.0.0 Safari/537.36",
-                viewport={"width": 1920, "height": 1080},
-                locale="en-US"
-            )
-            await context.add_init_script(STEALTH_SCRIPT)
-            
+        # Reuse the shared scrape browser (iframe-access launch flags); only
+        # the (cheap) context is per request
+        async with get_browser_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/121.0.0.0 Safari/537.36",
+            stealth_script=STEALTH_SCRIPT,
+            block_resources=BLOCKED_RESOURCE_TYPES,
+            block_trackers=True,
+            headless=False,
+            scrape=True,
+        ) as context:
             page = await context.new_page()
-            await page.route("**/*", lambda r: r.abort() if r.request.resource_type in {"media", "font"} else r.continue_())
             
             print(f"🔗 Navigating to {'Google Form' if is_google_form else 'page'}...")
             await page.goto(url, wait_until="domcontentloaded", timeout=120000)
@@ -252,28 +289,27 @@ async def _async_get_form_schema(url: str, generate_speech: bool = True, wait_fo
             
             print(f"✓ Found {len(forms_data)} form(s)")
             
-            try:
-                await page.unroute_all(behavior='ignoreErrors')
-            except:
-                pass
-            await browser.close()
-            
             # Process and enrich fields
             fields = _process_forms(forms_data)
             
-            result = {
-                'forms': fields,
-                'url': url,
-                'is_google_form': is_google_form,
-                'total_forms': len(fields),
-                'total_fields': sum(len(f['fields']) for f in fields)
-            }
-            
-            # Generate speech if requested
+            # Start TTS (blocking HTTP, so in a thread) before the context is
+            # torn down so the two overlap
+            speech_task = None
             if generate_speech and fields:
-                result['speech'] = _generate_speech(fields)
-            
-            return result
+                speech_task = asyncio.create_task(asyncio.to_thread(_generate_speech, fields))
+        
+        result = {
+            'forms': fields,
+            'url': url,
+            'is_google_form': is_google_form,
+            'total_forms': len(fields),
+            'total_fields': sum(len(f['fields']) for f in fields)
+        }
+        
+        if speech_task:
+            result['speech'] = await speech_task
+        
+        return result
             
     except Exception as e:
         print(f"❌ Scraping failed: {e}")
@@ -656,9 +692,14 @@ _STANDARD_EXTRACTION_MOVED = r"""
 
 def _extract_with_beautifulsoup(html: str) -> List[Dict]:
     """BeautifulSoup fallback extraction with radio/checkbox grouping."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, SOUP_PARSER)
     forms = []
     
+    # Index labels once instead of scanning the whole tree per field
+    labels_by_for = {}
+    for lbl in soup.find_all("label", attrs={"for": True}):
+        labels_by_for.setdefault(lbl["for"], lbl)
+    
     for idx, form in enumerate(soup.find_all("form")):
         fields = []
         processed_radio_groups = set()
@@ -681,7 +722,7 @@ def _extract_with_beautifulsoup(html: str) -> List[Dict]:
                 for r in radios:
                     opt_label = r.get("aria-label")
                     if not opt_label and r.get("id"):
-                        lbl = soup.find("label", {"for": r["id"]})
+                        lbl = labels_by_for.get(r["id"])
                         if lbl:
                             opt_label = lbl.get_text(strip=True)
                     if not opt_label:
@@ -721,7 +762,7 @@ def _extract_with_beautifulsoup(html: str) -> List[Dict]:
                     for c in checkboxes:
                         opt_label = c.get("aria-label")
                         if not opt_label and c.get("id"):
-                            lbl = soup.find("label", {"for": c["id"]})
+                            lbl = labels_by_for.get(c["id"])
                             if lbl:
                                 opt_label = lbl.get_text(strip=True)
                         if not opt_label:
@@ -739,7 +780,7 @@ def _extract_with_beautifulsoup(html: str) -> List[Dict]:
             
             label = None
             if tag.get("id"):
-                lbl = soup.find("label", {"for": tag["id"]})
+                lbl = labels_by_for.get(tag["id"])
                 if lbl:
                     label = lbl.get_text(strip=True)
             
@@ -948,25 +989,22 @@ def _process_forms(forms_data: List[Dict]) -> List[Dict]:
             "fields": []
         }
         
-        for field in form.get("fields", []):
+        # Hidden fields were already filtered out above; don't re-scan them
+        for field in visible_fields:
             field_type = field.get("type", "text")
             
-            if field.get("hidden") or field_type == "hidden":
-                continue
-            
             field_name_lower = (field.get("name") or "").lower()
             if "fax" in field_name_lower or "honeypot" in field_name_lower:
                 continue
                 
-            enriched = {
-                **field,
-                "display_name": _generate_display_name(field),
-                "purpose": _detect_purpose(field),
-                "is_checkbox": field_type in ["checkbox", "checkbox-group"],
-                "is_multiple_choice": field_type in ["radio", "radio-group", "mcq"],
-                "is_dropdown": field_type in ["select", "dropdown"],
-            }
-            processed["fields"].append(enriched)
+            # Extracted field dicts are not shared, so enrich them in place
+            # rather than copying every key into a new dict
+            field["display_name"] = _generate_display_name(field)
+            field["purpose"] = _detect_purpose(field)
+            field["is_checkbox"] = field_type in _CHECKBOX_TYPES
+            field["is_multiple_choice"] = field_type in _MULTIPLE_CHOICE_TYPES
+            field["is_dropdown"] = field_type in _DROPDOWN_TYPES
+            processed["fields"].append(field)
         
         if processed["fields"]:
             result.append(processed)
@@ -978,8 +1016,8 @@ def _detect_purpose(field: Dict) -> str:
     """Detect semantic purpose of a field."""
     text = f"{field.get('name', '')} {field.get('label', '')} {field.get('placeholder', '')}".lower()
     
-    for purpose, keywords in FIELD_PATTERNS.items():
-        if any(kw in text for kw in keywords):
+    for purpose, pattern in _PURPOSE_PATTERNS:
+        if pattern.search(text):
             return purpose
     
     return field.get('type', 'text')
@@ -994,7 +1032,7 @@ def _generate_display_name(field: Dict) -> str:
         return field['placeholder'].strip()
     
     name = field.get('name', 'Field')
-    for prefix in ['input_', 'field_', 'form_', 'data_', 'entry.']:
+    for prefix in _DISPLAY_NAME_PREFIXES:
         if name.lower().startswith(prefix):
             name = name[len(prefix):]
     
@@ -1004,8 +1042,9 @@ def _generate_display_name(field: Dict) -> str:
 def _generate_speech(fields: List[Dict]) -> Dict:
     """Generate speech data for fields."""
     try:
-        from services.voice.speech import SpeechService
-        service = SpeechService(api_key=os.getenv('ELEVENLABS_API_KEY'))
+        # Shared service keeps its pooled ElevenLabs connections across scrapes
+        from core.dependencies import get_speech_service
+        service = get_speech_service()
         all_fields = [f for form in fields for f in form.get('fields', [])]
         return service.generate_form_speech(all_fields)
     except Exception as e:
@@ -1017,95 +1056,23 @@ def _generate_speech(fields: List[Dict]) -> Dict:
 # UTILITY FUNCTIONS
 # ============================================================================
 
-def create_template(forms: List[Dict]) -> Dict[str, Any]:
-    """Create a template dictionary for form filling."""
-    template = {"forms": []}
-    
-    for form in forms:
-        form_tpl = {"form_index": form.get("formIndex"), "form_name": form.get("name"), "fields": {}}
-        
-        for field in form.get("fields", []):
-            name = field.get("name")
-            if not name:
-                continue
-            
-            ftype = field.get("type", "text")
-            
-            field_template = {
-                "display_name": field.get("display_name"),
-                "type": ftype,
-                "required": field.get("required", False)
-            }
-            
-            if ftype == "checkbox":
-                field_template["value"] = False
-            elif ftype == "checkbox-group":
-                field_template["value"] = []
-                field_template["options"] = field.get("options", [])
-            elif ftype in ["radio", "mcq", "dropdown", "select"]:
-                field_template["value"] = None
-                field_template["options"] = field.get("options", [])
-            elif ftype == "scale":
-                field_template["value"] = None
-                field_template["scale_min"] = field.get("scale_min")
-                field_template["scale_max"] = field.get("scale_max")
-            elif ftype == "grid":
-                field_template["value"] = {}
-                field_template["rows"] = field.get("rows", [])
-                field_template["columns"] = field.get("columns", [])
-            elif ftype == "file":
-                field_template["value"] = None
-                field_template["accept"] = field.get("accept")
-                field_template["multiple"] = field.get("multiple", False)
-            else:
-                field_template["value"] = ""
-                
-            form_tpl["fields"][name] = field_template
-        
-        template["forms"].append(form_tpl)
-    
-    return template
-
-
-def validate_field_value(value: Any, field: Dict) -> tuple:
-    """Validate a field value. Returns (is_valid, error_message)."""
-    ftype = field.get("type", "text")
-    required = field.get("required", False)
-    
-    if required and not value:
-        return False, f"{field.get('display_name', 'Field')} is required"
-    
-    if not value:
-        return True, ""
-    
-    if ftype == "email" and not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', str(value)):
-        return False, "Invalid email format"
-    
-    if ftype in ["tel", "phone"] and not re.match(r'^[\d\s\-\+\(\)]+$', str(value)):
-        return False, "Invalid phone format"
-    
-    if ftype == "url" and not re.match(r'^https?://', str(value)):
-        return False, "Invalid URL format"
-    
-    if ftype in ["radio", "dropdown", "select"]:
-        options = field.get("options", [])
-        valid_values = [o.get("value") or o.get("label") for o in options]
-        if value not in valid_values:
-            return False, f"Invalid option: {value}"
-    
-    return True, ""
-
-
 def get_form_summary(forms: List[Dict]) -> Dict:
     """Get a summary of forms."""
-    total_fields = sum(len(f.get('fields', [])) for f in forms)
-    required = sum(1 for f in forms for field in f.get('fields', []) if field.get('required'))
+    # Single walk over forms -> fields for all three aggregates
+    total_fields = required = 0
+    field_types = set()
+    for f in forms:
+        for field in f.get('fields', []):
+            total_fields += 1
+            if field.get('required'):
+                required += 1
+            field_types.add(field.get('type'))
     
     return {
         "total_forms": len(forms),
         "total_fields": total_fields,
         "required_fields": required,
-        "field_types": list(set(field.get('type') for f in forms for field in f.get('fields', [])))
+        "field_types": list(field_types)
     }
 
 
@@ -1125,7 +1092,7 @@ def format_field_value(value: str, purpose: str, field_type: str = None) -> str:
     if purpose == 'email':
         return value.lower().replace(' ', '')
     if purpose in ['phone', 'mobile']:
-        return re.sub(r'[^\d+]', '', value)
+        return _NON_PHONE_CHARS_RE.sub('', value)
     return value.strip()
 
 def format_email_input(text: str) -> str:
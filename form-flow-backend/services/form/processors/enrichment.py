@@ -9,6 +9,12 @@ from typing import List, Dict, Any
 
 from ..utils.constants import FIELD_PATTERNS
 
+# Validation / formatting patterns
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+_PHONE_RE = re.compile(r'^[\d\s\-\+\(\)]+$')
+_URL_RE = re.compile(r'^https?://')
+_NON_PHONE_CHARS_RE = re.compile(r'[^\d+]')
+
 
 def process_forms(forms_data: List[Dict]) -> List[Dict]:
     """Process and enrich extracted forms with additional metadata."""
@@ -122,6 +128,24 @@ def generate_speech(fields: List[Dict]) -> Dict:
         return {}
 
 
+# Type-specific template entries, looked up once per field instead of
+# walking an if/elif chain. Handlers return fresh dicts so mutable values
+# ([] / {}) are never shared between fields.
+_CHOICE_TEMPLATE = lambda f: {"value": None, "options": f.get("options", [])}
+_TEMPLATE_HANDLERS = {
+    "checkbox": lambda f: {"value": False},
+    "checkbox-group": lambda f: {"value": [], "options": f.get("options", [])},
+    "radio": _CHOICE_TEMPLATE,
+    "mcq": _CHOICE_TEMPLATE,
+    "dropdown": _CHOICE_TEMPLATE,
+    "select": _CHOICE_TEMPLATE,
+    "scale": lambda f: {"value": None, "scale_min": f.get("scale_min"), "scale_max": f.get("scale_max")},
+    "grid": lambda f: {"value": {}, "rows": f.get("rows", []), "columns": f.get("columns", [])},
+    "file": lambda f: {"value": None, "accept": f.get("accept"), "multiple": f.get("multiple", False)},
+}
+_DEFAULT_TEMPLATE = lambda f: {"value": ""}
+
+
 def create_template(forms: List[Dict]) -> Dict[str, Any]:
     """Create a template dictionary for form filling."""
     template = {"forms": []}
@@ -141,29 +165,7 @@ def create_template(forms: List[Dict]) -> Dict[str, Any]:
                 "type": ftype,
                 "required": field.get("required", False)
             }
-            
-            if ftype == "checkbox":
-                field_template["value"] = False
-            elif ftype == "checkbox-group":
-                field_template["value"] = []
-                field_template["options"] = field.get("options", [])
-            elif ftype in ["radio", "mcq", "dropdown", "select"]:
-                field_template["value"] = None
-                field_template["options"] = field.get("options", [])
-            elif ftype == "scale":
-                field_template["value"] = None
-                field_template["scale_min"] = field.get("scale_min")
-                field_template["scale_max"] = field.get("scale_max")
-            elif ftype == "grid":
-                field_template["value"] = {}
-                field_template["rows"] = field.get("rows", [])
-                field_template["columns"] = field.get("columns", [])
-            elif ftype == "file":
-                field_template["value"] = None
-                field_template["accept"] = field.get("accept")
-                field_template["multiple"] = field.get("multiple", False)
-            else:
-                field_template["value"] = ""
+            field_template.update(_TEMPLATE_HANDLERS.get(ftype, _DEFAULT_TEMPLATE)(field))
                 
             form_tpl["fields"][name] = field_template
         
@@ -172,48 +174,71 @@ def create_template(forms: List[Dict]) -> Dict[str, Any]:
     return template
 
 
+def _format_validator(pattern: re.Pattern, message: str):
+    """Build a validator that checks the value against a compiled pattern."""
+    return lambda value, field: "" if pattern.match(str(value)) else message
+
+
+def _validate_option(value: Any, field: Dict) -> str:
+    # Stop at the first matching option instead of building the full
+    # value list and then scanning it again
+    options = field.get("options", [])
+    if any((o.get("value") or o.get("label")) == value for o in options):
+        return ""
+    return f"Invalid option: {value}"
+
+
+# Type -> validator returning an error message ("" when valid); types
+# without an entry only get the required check
+_PHONE_VALIDATOR = _format_validator(_PHONE_RE, "Invalid phone format")
+_FIELD_VALIDATORS = {
+    "email": _format_validator(_EMAIL_RE, "Invalid email format"),
+    "tel": _PHONE_VALIDATOR,
+    "phone": _PHONE_VALIDATOR,
+    "url": _format_validator(_URL_RE, "Invalid URL format"),
+    "radio": _validate_option,
+    "dropdown": _validate_option,
+    "select": _validate_option,
+}
+
+
 def validate_field_value(value: Any, field: Dict) -> tuple:
     """Validate a field value. Returns (is_valid, error_message)."""
     ftype = field.get("type", "text")
     required = field.get("required", False)
     
-    # Required check
     if required and not value:
         return False, f"{field.get('display_name', 'Field')} is required"
     
     if not value:
         return True, ""
     
-    # Type-specific validation
-    if ftype == "email" and not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', str(value)):
-        return False, "Invalid email format"
-    
-    if ftype in ["tel", "phone"] and not re.match(r'^[\d\s\-\+\(\)]+$', str(value)):
-        return False, "Invalid phone format"
-    
-    if ftype == "url" and not re.match(r'^https?://', str(value)):
-        return False, "Invalid URL format"
-    
-    # Options validation
-    if ftype in ["radio", "dropdown", "select"]:
-        options = field.get("options", [])
-        valid_values = [o.get("value") or o.get("label") for o in options]
-        if value not in valid_values:
-            return False, f"Invalid option: {value}"
+    validator = _FIELD_VALIDATORS.get(ftype)
+    if validator:
+        error = validator(value, field)
+        if error:
+            return False, error
     
     return True, ""
 
 
 def get_form_summary(forms: List[Dict]) -> Dict:
     """Get a summary of forms."""
-    total_fields = sum(len(f.get('fields', [])) for f in forms)
-    required = sum(1 for f in forms for field in f.get('fields', []) if field.get('required'))
+    # Single walk over forms -> fields for all three aggregates
+    total_fields = required = 0
+    field_types = set()
+    for f in forms:
+        for field in f.get('fields', []):
+            total_fields += 1
+            if field.get('required'):
+                required += 1
+            field_types.add(field.get('type'))
     
     return {
         "total_forms": len(forms),
         "total_fields": total_fields,
         "required_fields": required,
-        "field_types": list(set(field.get('type') for f in forms for field in f.get('fields', [])))
+        "field_types": list(field_types)
     }
 
 
@@ -239,7 +264,7 @@ def format_field_value(value: str, purpose: str, field_type: str = None) -> str:
     if purpose == 'email':
         return value.lower().replace(' ', '')
     if purpose in ['phone', 'mobile']:
-        return re.sub(r'[^\d+]', '', value)
+        return _NON_PHONE_CHARS_RE.sub('', value)
     return value.strip()
 
 
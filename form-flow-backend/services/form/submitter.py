@@ -17,8 +17,32 @@ from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Page scripts take their inputs as evaluate() arguments: the source is
+# identical on every call and values need no manual escaping
+SET_VALUE_JS = """
+    ([el, value]) => {
+        el.value = value;
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+"""
 
-
+FILL_BY_NAME_JS = """
+    ([name, value]) => {
+        const n = CSS.escape(name);
+        const selectors = [`[name="${n}"]`, `#${n}`, `[id="${n}"]`, `input[name="${n}"]`, `textarea[name="${n}"]`];
+        for (const sel of selectors) {
+            const el = document.querySelector(sel);
+            if (el) {
+                el.value = value;
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+                return true;
+            }
+        }
+        return false;
+    }
+"""
 
 
 class FormSubmitter:
@@ -396,7 +420,7 @@ class FormSubmitter:
         try:
             min_v, max_v = float(await element.get_attribute('min') or 0), float(await element.get_attribute('max') or 100)
             target = max(min_v, min(max_v, float(value)))
-            await page.evaluate(f"(el) => {{ el.value = {target}; el.dispatchEvent(new Event('input', {{bubbles: true}})); el.dispatchEvent(new Event('change', {{bubbles: true}})); }}", element)
+            await page.evaluate(SET_VALUE_JS, [element, target])
             return True
         except:
             return False
@@ -404,22 +428,7 @@ class FormSubmitter:
     async def _fill_with_js(self, page, field_name: str, value: str) -> bool:
         """Fallback: Fill via JavaScript injection."""
         try:
-            escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("'", "\\'").replace("\n", "\\n")
-            return await page.evaluate(f"""
-                () => {{
-                    const selectors = ['[name="{field_name}"]', '#{field_name}', '[id="{field_name}"]', 'input[name="{field_name}"]', 'textarea[name="{field_name}"]'];
-                    for (const sel of selectors) {{
-                        const el = document.querySelector(sel);
-                        if (el) {{
-                            el.value = "{escaped}";
-                            el.dispatchEvent(new Event('input', {{bubbles: true}}));
-                            el.dispatchEvent(new Event('change', {{bubbles: true}}));
-                            return true;
-                        }}
-                    }}
-                    return false;
-                }}
-            """)
+            return await page.evaluate(FILL_BY_NAME_JS, [field_name, value])
         except:
             return False
 
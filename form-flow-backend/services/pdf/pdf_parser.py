@@ -14,6 +14,12 @@ Key Features:
 """
 
 import logging
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -50,6 +56,41 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# Word extraction fans out to worker processes only when there are at
+# least two page batches; smaller documents are parsed inline
+PAGES_PER_WORKER_BATCH = 32
+PARALLEL_PAGE_THRESHOLD = 2 * PAGES_PER_WORKER_BATCH
+# One shared, bounded pool for all requests (kept small for 1GB hosts)
+MAX_PAGE_WORKERS = min(2, os.cpu_count() or 1)
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Get the shared word-extraction pool, creating it on first use.
+    
+    Uses the spawn start method so workers never fork the multithreaded
+    server process.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=MAX_PAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _page_pool
+
+
+def shutdown_page_pool() -> None:
+    """Stop the shared word-extraction pool, if it was started."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+            _page_pool = None
+
 
 # =============================================================================
 # Data Models
@@ -156,6 +197,45 @@ class PdfField:
             "section": self.section,
             "form_line": self.form_line,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PdfField":
+        """Rebuild a field from its to_dict() representation."""
+        position = data.get("position", {})
+        constraints = data.get("constraints", {})
+        try:
+            field_type = FieldType(data.get("type", "text"))
+        except ValueError:
+            field_type = FieldType.UNKNOWN
+        
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            field_type=field_type,
+            label=data.get("label", ""),
+            position=FieldPosition(
+                page=data.get("page", 0),
+                x=position.get("x", 0.0),
+                y=position.get("y", 0.0),
+                width=position.get("width", 0.0),
+                height=position.get("height", 0.0),
+            ),
+            constraints=FieldConstraints(
+                max_length=constraints.get("max_length"),
+                required=constraints.get("required", False),
+                multiline=constraints.get("multiline", False),
+                pattern=constraints.get("pattern"),
+            ),
+            options=data.get("options", []),
+            default_value=data.get("default_value"),
+            current_value=data.get("current_value"),
+            font_size=data.get("font_size"),
+            text_capacity=data.get("text_capacity"),
+            display_name=data.get("display_name"),
+            purpose=data.get("purpose"),
+            section=data.get("section"),
+            form_line=data.get("form_line"),
+        )
 
 
 @dataclass
@@ -192,6 +272,23 @@ class PdfFormSchema:
             "groups": [g.to_dict() for g in self.groups],  # Use to_dict for proper enum serialization
             "metadata": self.metadata,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PdfFormSchema":
+        """
+        Rebuild a schema from its to_dict() representation.
+        
+        Groups are not restored; fields carry everything needed for filling.
+        """
+        return cls(
+            file_path=data.get("file_path", ""),
+            file_name=data.get("file_name", ""),
+            total_pages=data.get("total_pages", 0),
+            fields=[PdfField.from_dict(f) for f in data.get("fields", [])],
+            is_xfa=data.get("is_xfa", False),
+            is_scanned=data.get("is_scanned", False),
+            metadata=data.get("metadata", {}),
+        )
 
 
 # =============================================================================
@@ -606,11 +703,9 @@ def _find_label_for_field(
     return best_label
 
 
-def _detect_purpose(field_name: str, label: str) -> Optional[str]:
-    """Detect semantic purpose of a field."""
-    combined = f"{field_name} {label}".lower()
-    
-    purpose_patterns = {
+# Compiled once at import; order matters - first matching purpose wins
+_PURPOSE_PATTERNS = tuple(
+    (purpose, re.compile(pattern)) for purpose, pattern in {
         "email": r"e[-_]?mail",
         # Improved phone pattern to catch "Contact Number" but avoid "Emergency Contact Name"
         "phone": r"(phone|tel|mobile|cell|contact\s*(number|no\.?|#)|primary\s*contact|alternate\s*contact)",
@@ -630,10 +725,16 @@ def _detect_purpose(field_name: str, label: str) -> Optional[str]:
         "website": r"(website|url|web)",
         "signature": r"(signature|sign)",
         "amount": r"(amount|fee|cost|price|total|salary|stipend)",
-    }
+    }.items()
+)
+
+
+def _detect_purpose(field_name: str, label: str) -> Optional[str]:
+    """Detect semantic purpose of a field."""
+    combined = f"{field_name} {label}".lower()
     
-    for purpose, pattern in purpose_patterns.items():
-        if re.search(pattern, combined):
+    for purpose, pattern in _PURPOSE_PATTERNS:
+        if pattern.search(combined):
             return purpose
     
     return None
@@ -780,6 +881,64 @@ def _detect_section(field_name: str, label: str, page_texts: List[Dict]) -> Opti
     return None
 
 
+def _open_plumber(pdf_path: Union[str, Path, bytes]):
+    """Open a pdfplumber document from a path or raw bytes."""
+    if isinstance(pdf_path, bytes):
+        return pdfplumber.open(io.BytesIO(pdf_path))
+    return pdfplumber.open(str(pdf_path))
+
+
+def _extract_page_words(
+    pdf_path: Union[str, Path, bytes],
+    page_indices: List[int],
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Extract word boxes for a batch of pages (runs inside worker processes)."""
+    with _open_plumber(pdf_path) as plumber_pdf:
+        return {
+            i: plumber_pdf.pages[i].extract_words() or []
+            for i in page_indices
+        }
+
+
+def _extract_words_by_page(
+    pdf_path: Union[str, Path, bytes],
+    total_pages: int,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Extract word boxes for every page, keyed by page index.
+    
+    pdfminer layout analysis is CPU-bound and holds the GIL, so large
+    documents are split into page batches parsed by a shared process pool.
+    Documents with fewer than two batches are parsed inline, where the
+    pool could add no parallelism.
+    """
+    pages = list(range(total_pages))
+    if total_pages < PARALLEL_PAGE_THRESHOLD or MAX_PAGE_WORKERS < 2:
+        return _extract_page_words(pdf_path, pages)
+    
+    batches = [
+        pages[i:i + PAGES_PER_WORKER_BATCH]
+        for i in range(0, total_pages, PAGES_PER_WORKER_BATCH)
+    ]
+    
+    page_texts: Dict[int, List[Dict[str, Any]]] = {}
+    try:
+        executor = _get_page_pool()
+        futures = [
+            executor.submit(_extract_page_words, pdf_path, batch)
+            for batch in batches
+        ]
+        for future in futures:
+            page_texts.update(future.result())
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            shutdown_page_pool()  # Recreated on the next large document
+        logger.warning(f"Parallel word extraction failed, falling back to serial: {e}")
+        return _extract_page_words(pdf_path, pages)
+    
+    return page_texts
+
+
 @benchmark("parse_acroform")
 def _parse_acroform(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
     """Parse AcroForm fields from PDF."""
@@ -788,10 +947,8 @@ def _parse_acroform(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
     try:
         if isinstance(pdf_path, bytes):
             reader = PdfReader(io.BytesIO(pdf_path))
-            plumber_pdf = pdfplumber.open(io.BytesIO(pdf_path))
         else:
             reader = PdfReader(str(pdf_path))
-            plumber_pdf = pdfplumber.open(str(pdf_path))
         
         # GENERIC XFA LABEL EXTRACTION
         # Parse XFA template to get labels directly from PDF (no hardcoded mappings!)
@@ -806,10 +963,7 @@ def _parse_acroform(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
             logger.debug(f"XFA parsing skipped: {e}")
         
         # Get text blocks for label detection (fallback for non-XFA)
-        page_texts = {}
-        for i, page in enumerate(plumber_pdf.pages):
-            words = page.extract_words() or []
-            page_texts[i] = words
+        page_texts = _extract_words_by_page(pdf_path, len(reader.pages))
         
         # Extract form fields
         pdf_fields = reader.get_fields() or {}
@@ -966,8 +1120,6 @@ def _parse_acroform(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
             
             fields.append(pdf_field)
         
-        plumber_pdf.close()
-        
     except Exception as e:
         logger.error(f"Error parsing AcroForm: {e}")
         raise PdfParsingError(f"AcroForm parsing failed: {str(e)}", original_error=e)
@@ -1012,6 +1164,8 @@ def _parse_visual_form(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
         
         field_id = 0
         seen_labels = set()
+        # Per-field detection details, emitted as a single log record
+        detections = []
         
         logger.info("Using coordinate-aware visual parsing.")
         
@@ -1126,7 +1280,7 @@ def _parse_visual_form(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
                         available_width = page_width - start_x - 40 # 40px right margin
                         field_width = max(100.0, available_width) # Min 100px
                         
-                        logger.info(f"Field '{label}' detected at Page {page_num+1} Baseline={max_bottom:.2f} X={start_x:.2f}")
+                        detections.append(f"  '{label}' at Page {page_num+1} Baseline={max_bottom:.2f} X={start_x:.2f}")
 
                         field = PdfField(
                             id=f"visual_field_{field_id}",
@@ -1151,6 +1305,8 @@ def _parse_visual_form(pdf_path: Union[str, Path, bytes]) -> List[PdfField]:
                 if matched: continue # Next line
 
         plumber_pdf.close()
+        if detections:
+            logger.info("Visual fields detected:\n" + "\n".join(detections))
         logger.info(f"Visual form parsing found {len(fields)} fields")
         
     except Exception as e:
@@ -1333,17 +1489,14 @@ def parse_pdf(
 
 def get_pdf_summary(schema: PdfFormSchema) -> Dict[str, Any]:
     """Get a summary of the PDF form."""
-    field_types = {}
-    for field in schema.fields:
-        ft = field.field_type.value
-        field_types[ft] = field_types.get(ft, 0) + 1
+    field_types = Counter(field.field_type.value for field in schema.fields)
     
     return {
         "file_name": schema.file_name,
         "total_pages": schema.total_pages,
         "total_fields": schema.total_fields,
         "required_fields": len(schema.required_fields),
-        "field_types": field_types,
+        "field_types": dict(field_types),
         "is_xfa": schema.is_xfa,
         "is_scanned": schema.is_scanned,
     }
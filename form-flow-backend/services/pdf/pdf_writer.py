@@ -15,7 +15,7 @@ import logging
 import io
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 import tempfile
 import shutil
 import re
@@ -27,6 +27,9 @@ from .exceptions import PdfFillingError, PdfResourceError
 from .utils import get_logger, benchmark, PerformanceTimer
 from .text_fitter import TextFitter, FitResult
 
+if TYPE_CHECKING:
+    from .pdf_parser import PdfFormSchema
+
 logger = get_logger(__name__)
 
 # PDF Libraries
@@ -188,9 +191,13 @@ class PdfFormWriter:
         output_path: Optional[Union[str, Path]] = None,
         flatten: bool = False,
         fit_text: bool = True,
+        schema: Optional["PdfFormSchema"] = None,
     ) -> FilledPdf:
         """
         Fill a PDF form with data.
+        
+        When the caller already parsed the template, pass its ``schema`` so
+        visual (non-AcroForm) filling does not parse the document again.
         """
         result = FilledPdf(success=True)
         
@@ -211,7 +218,7 @@ class PdfFormWriter:
                 # No AcroForm fields - use visual overlay directly
                 logger.warning("No AcroForm fields found. Attempting visual filling.")
                 result.warnings.append("No AcroForm fields found. Attempting visual filling.")
-                self._fill_overlay(reader, writer, data, result)
+                self._fill_overlay(reader, writer, data, result, schema=schema)
             else:
                 # Fill each AcroForm field first
                 for field_name, value in data.items():
@@ -335,8 +342,14 @@ class PdfFormWriter:
         writer: PdfWriter,
         data: Dict[str, str],
         result: FilledPdf,
+        schema: Optional["PdfFormSchema"] = None,
     ):
-        """Fill visual form by overlaying text."""
+        """
+        Fill visual form by overlaying text.
+        
+        Uses ``schema`` for field coordinates when given, otherwise
+        re-parses the page content for its visual structure.
+        """
         import traceback
         if not REPORTLAB_AVAILABLE:
             result.warnings.append("ReportLab required for visual form filling")
@@ -345,20 +358,23 @@ class PdfFormWriter:
         try:
             logger.info("Starting visual overlay fill...")
             
-            # Re-parse to get field coordinates
-            from .pdf_parser import parse_pdf
-            
-            # Create a bytes buffer from the reader content for parsing
-            pdf_bytes_io = io.BytesIO()
-            tmp_writer = PdfWriter()
-            for page in reader.pages:
-                tmp_writer.add_page(page)
-            tmp_writer.write(pdf_bytes_io)
-            pdf_bytes = pdf_bytes_io.getvalue()
-            
-            logger.info("Re-parsing PDF for visual structure...")
-            schema = parse_pdf(pdf_bytes, use_ocr=False)
-            logger.info(f"Visual parser found {len(schema.fields)} fields")
+            if schema is None:
+                # Re-parse to get field coordinates
+                from .pdf_parser import parse_pdf
+                
+                # Create a bytes buffer from the reader content for parsing
+                pdf_bytes_io = io.BytesIO()
+                tmp_writer = PdfWriter()
+                for page in reader.pages:
+                    tmp_writer.add_page(page)
+                tmp_writer.write(pdf_bytes_io)
+                pdf_bytes = pdf_bytes_io.getvalue()
+                
+                logger.info("Re-parsing PDF for visual structure...")
+                schema = parse_pdf(pdf_bytes, use_ocr=False)
+                logger.info(f"Visual parser found {len(schema.fields)} fields")
+            else:
+                logger.info(f"Using pre-parsed schema with {len(schema.fields)} fields")
             
             filled_fields = 0
             
@@ -698,6 +714,7 @@ def fill_pdf(
     data: Dict[str, str],
     output_path: Optional[Union[str, Path]] = None,
     flatten: bool = False,
+    schema: Optional["PdfFormSchema"] = None,
 ) -> FilledPdf:
     """
     Fill a PDF form with data.
@@ -707,12 +724,13 @@ def fill_pdf(
         data: Dictionary of {field_name: value}
         output_path: Path to save filled PDF (None for bytes output)
         flatten: Whether to flatten form fields
+        schema: Schema from a previous parse_pdf() of the same template
         
     Returns:
         FilledPdf with results
     """
     writer = PdfFormWriter()
-    return writer.fill(template_path, data, output_path, flatten)
+    return writer.fill(template_path, data, output_path, flatten, schema=schema)
 
 
 def preview_fill(
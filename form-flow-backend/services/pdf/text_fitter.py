@@ -136,6 +136,11 @@ class TextFitter:
     
     def __init__(self, domain: str = "general"):
         self.abbreviations = get_abbreviations(domain)
+        # Compile once, longest keys first so longer matches win
+        self._abbreviation_patterns = [
+            (re.compile(r'\b' + re.escape(key) + r'\b', re.IGNORECASE), self.abbreviations[key])
+            for key in sorted(self.abbreviations, key=len, reverse=True)
+        ]
         self.llm_compressor = LLMTextCompressor()
         
     def fit(
@@ -224,13 +229,9 @@ class TextFitter:
     def _apply_abbreviations(self, text: str) -> str:
         """Apply dictionary substitutions."""
         result = text
-        # Sort keys by length to replace longest matches first
-        sorted_keys = sorted(self.abbreviations.keys(), key=len, reverse=True)
-        
-        for key in sorted_keys:
-            # Whole word match only
-            pattern = re.compile(r'\b' + re.escape(key) + r'\b', re.IGNORECASE)
-            result = pattern.sub(self.abbreviations[key], result)
+        # Whole word match only
+        for pattern, replacement in self._abbreviation_patterns:
+            result = pattern.sub(replacement, result)
             
         return result
 
@@ -4,6 +4,12 @@ from typing import Dict, List, Any, Optional
 import json
 import re
 from services.form.parser import format_email_input
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Spoken fragments that suggest the user is dictating an email address
+EMAIL_TRANSCRIPT_MARKERS = (' at gmail', ' at yahoo', ' at outlook', 'dot com')
 
 class VoiceProcessor:
     def __init__(self, openai_key: str = None, gemini_key: str = None):
@@ -87,7 +93,7 @@ class VoiceProcessor:
                 
                 # If Local LLM is confident, return immediately!
                 if local_result.get('confidence', 0) > 0.6:
-                    print(f"⚡ Local LLM Hit: {local_result['value']} (conf: {local_result['confidence']})")
+                    logger.debug(f"Local LLM hit (conf: {local_result['confidence']})")
                     return {
                         "processed_text": local_result['value'],
                         "confidence": local_result['confidence'],
@@ -95,7 +101,7 @@ class VoiceProcessor:
                         "source": "local_phi2"
                     }
         except Exception as e:
-            print(f"⚠️ Local LLM skipped: {e}")
+            logger.debug(f"Local LLM skipped: {e}")
 
         # 2. Fallback to Gemini (Cloud)
         if not self.client:
@@ -106,16 +112,15 @@ class VoiceProcessor:
         field_name = field_info.get('label', field_info.get('name', 'field'))
         
         # Enhanced email detection: check type, flag, name patterns, or transcript content
+        field_name_lower = field_name.lower()
+        transcript_lower = transcript.lower()
         is_email = (
             field_info.get('is_email', False) or 
             field_type == 'email' or
-            'email' in field_name.lower() or
-            'e-mail' in field_name.lower() or
+            'email' in field_name_lower or
+            'e-mail' in field_name_lower or
             '@' in transcript or
-            ' at gmail' in transcript.lower() or
-            ' at yahoo' in transcript.lower() or
-            ' at outlook' in transcript.lower() or
-            'dot com' in transcript.lower()
+            any(marker in transcript_lower for marker in EMAIL_TRANSCRIPT_MARKERS)
         )
         
         is_checkbox = field_info.get('is_checkbox', False) or field_type == 'checkbox'
@@ -12,8 +12,10 @@ Usage:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Optional, Dict, Any, Generator
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Generator, List
 
 from utils.logging import get_logger, log_api_call
 from utils.exceptions import SpeechGenerationError
@@ -40,6 +42,17 @@ class SpeechService:
     # Default voice settings
     DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel
     DEFAULT_MODEL = "eleven_turbo_v2_5"
+    VOICE_SETTINGS = {
+        "stability": 0.5,
+        "similarity_boost": 0.75
+    }
+    
+    # Connection pool sizing for the shared HTTP session
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 40
+    
+    # Concurrent ElevenLabs requests when synthesizing a whole form
+    MAX_PARALLEL_REQUESTS = 8
     
     def __init__(
         self,
@@ -59,6 +72,20 @@ class SpeechService:
         self.default_voice_id = voice_id or self.DEFAULT_VOICE_ID
         self.model = model or self.DEFAULT_MODEL
         
+        # Shared session keeps TCP/TLS connections to ElevenLabs warm across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE
+        )
+        self._session.mount("https://", adapter)
+        # Request headers never vary per call, so build them once
+        self._session.headers.update({
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": self.api_key or ""
+        })
+        
         if not self.api_key:
             logger.warning("ElevenLabs API key not configured - TTS disabled")
         else:
@@ -92,28 +119,18 @@ class SpeechService:
         target_voice_id = voice_id or self.default_voice_id
         url = f"{self.API_BASE}/text-to-speech/{target_voice_id}"
         
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self.api_key
-        }
-        
         data = {
             "text": text,
             "model_id": self.model,
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75
-            }
+            "voice_settings": self.VOICE_SETTINGS
         }
         
         try:
             logger.debug(f"Generating speech for: '{text[:50]}...'")
             
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json=data,
-                headers=headers,
                 timeout=30
             )
             
@@ -136,6 +153,46 @@ class SpeechService:
             log_api_call("ElevenLabs", "text-to-speech", success=False, error=str(e))
             return None
 
+    def generate_form_speech(self, fields: List[Dict[str, Any]]) -> Dict[str, Dict[str, bytes]]:
+        """
+        Generate prompt audio for every named field of a form.
+        
+        Identical prompts are synthesized once, and distinct prompts are
+        requested concurrently over the shared session, so a form costs
+        roughly one round-trip instead of one per field.
+        
+        Args:
+            fields: Field metadata dicts (name, type, label)
+            
+        Returns:
+            dict: field name -> {'audio': mp3 bytes} for fields that succeeded
+        """
+        prompts = {}
+        for field in fields:
+            name = field.get('name')
+            if name:
+                prompt = self._create_field_prompt(field)
+                if prompt:
+                    prompts[name] = prompt
+        
+        if not prompts or not self.api_key:
+            return {}
+        
+        unique_prompts = list(dict.fromkeys(prompts.values()))
+        workers = min(self.MAX_PARALLEL_REQUESTS, len(unique_prompts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            audio_by_prompt = dict(zip(unique_prompts, pool.map(self.text_to_speech, unique_prompts)))
+        
+        return {
+            name: {'audio': audio_by_prompt[prompt]}
+            for name, prompt in prompts.items()
+            if audio_by_prompt[prompt]
+        }
+
+    def close(self) -> None:
+        """Close the shared HTTP session and release pooled connections."""
+        self._session.close()
+
     def _create_field_prompt(self, field_info: Dict[str, Any]) -> str:
         """
         Create a natural speech prompt for a form field.
@@ -195,37 +252,28 @@ class SpeechService:
         target_voice_id = voice_id or self.default_voice_id
         url = f"{self.API_BASE}/text-to-speech/{target_voice_id}/stream"
         
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": self.api_key
-        }
-        
         data = {
             "text": text,
             "model_id": self.model,
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.75
-            }
+            "voice_settings": self.VOICE_SETTINGS
         }
         
         try:
-            response = requests.post(
+            # Context manager returns the connection to the pool even if the
+            # consumer stops iterating early
+            with self._session.post(
                 url,
                 json=data,
-                headers=headers,
                 stream=True,
                 timeout=60
-            )
-            
-            if response.status_code == 200:
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk:
-                        yield chunk
-            else:
-                logger.error(f"ElevenLabs stream error: {response.text[:200]}")
-                yield b""
+            ) as response:
+                if response.status_code == 200:
+                    for chunk in response.iter_content(chunk_size=1024):
+                        if chunk:
+                            yield chunk
+                else:
+                    logger.error(f"ElevenLabs stream error: {response.text[:200]}")
+                    yield b""
                 
         except Exception as e:
             logger.error(f"ElevenLabs stream exception: {e}")
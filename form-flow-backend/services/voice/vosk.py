@@ -3,9 +3,13 @@ Vosk Offline Speech-to-Text Service
 Uses local Vosk models for privacy-preserving, offline transcription.
 """
 
+import io
 import os
 import json
-from typing import Dict, Any, Optional
+import wave
+from typing import Dict, Any, Optional, List, Tuple
+
+from utils.logging import get_logger
 
 try:
     from vosk import Model, KaldiRecognizer, SetLogLevel
@@ -13,11 +17,26 @@ try:
 except ImportError:
     VOSK_AVAILABLE = False
 
+# Recognizer results are decoded once per endpointed segment
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = get_logger(__name__)
+
 
 class VoskService:
+    # 250ms chunks for whole-buffer transcription
+    BATCH_CHUNK_BYTES = 8000
+    # ~32ms of 16kHz audio; anything shorter cannot contain a word
+    MIN_AUDIO_BYTES = 1024
+    # Peak int16 amplitude below which a clip is treated as silence
+    SILENCE_PEAK = 500
+
     def __init__(self, model_path: str = None):
         if not VOSK_AVAILABLE:
-            print("⚠️ Vosk not installed. Basic transcription unavailable.")
+            logger.warning("Vosk not installed. Basic transcription unavailable.")
             self.model = None
             return
 
@@ -42,15 +61,15 @@ class VoskService:
                     break
         
         if model_path and os.path.exists(model_path):
-            print(f"🎤 Loading Vosk model from: {model_path}")
+            logger.info(f"Loading Vosk model from: {model_path}")
             try:
                 self.model = Model(model_path)
-                print("✅ Vosk model loaded successfully")
+                logger.info("Vosk model loaded successfully")
             except Exception as e:
-                print(f"❌ Failed to load Vosk model: {e}")
+                logger.error(f"Failed to load Vosk model: {e}", exc_info=True)
                 self.model = None
         else:
-            print(f"⚠️ Vosk model not found at {model_path or possible_paths}")
+            logger.warning(f"Vosk model not found at {model_path or possible_paths}")
             self.model = None
 
     def is_available(self) -> bool:
@@ -59,7 +78,11 @@ class VoskService:
     def transcribe_audio(self, audio_data: bytes, sample_rate: int = 16000) -> Dict[str, Any]:
         """
         Transcribe raw audio data using Vosk.
-        Expects PCM 16kHz mono audio by default.
+        Expects PCM 16kHz mono audio by default; WAV uploads are unwrapped
+        to raw PCM at their native sample rate.
+
+        The buffer is fed to the recognizer in fixed-size chunks so every
+        endpointed segment is kept, not just the first one.
         """
         if not self.model:
             return {
@@ -69,35 +92,99 @@ class VoskService:
             }
 
         try:
-            rec = KaldiRecognizer(self.model, sample_rate)
-            rec.SetWords(True)
-            
-            # Vosk expects bytes, and processes chunks or whole stream
-            if rec.AcceptWaveform(audio_data):
-                res = json.loads(rec.Result())
-            else:
-                res = json.loads(rec.FinalResult())
-                
-            text = res.get("text", "")
-            
-            if text:
+            audio_data, sample_rate = self._to_pcm(audio_data, sample_rate)
+            rejection = self._precheck(audio_data)
+            if rejection:
                 return {
-                    "success": True,
-                    "transcript": text,
-                    "confidence": 1.0, # Vosk doesn't provide overall confidence easily in simple mode
-                    "provider": "vosk"
-                }
-            else:
-                 return {
                     "success": False,
-                    "error": "No speech detected",
+                    "error": rejection,
                     "transcript": ""
                 }
+            # Word-level timings are never surfaced, so leave SetWords off
+            rec = KaldiRecognizer(self.model, sample_rate)
+            segments = self._recognize(rec, audio_data, self.BATCH_CHUNK_BYTES)
+            return self._build_result(segments)
                 
         except Exception as e:
-            print(f"❌ Vosk transcription error: {e}")
+            logger.error(f"Vosk transcription error: {e}", exc_info=True)
             return {
                 "success": False,
                 "error": str(e),
                 "transcript": ""
             }
+
+    @classmethod
+    def _precheck(cls, pcm: bytes) -> Optional[str]:
+        """
+        Reject empty, too-short, or silent PCM before starting a decode.
+
+        Returns an error message, or None if the audio is worth decoding.
+        """
+        if len(pcm) < cls.MIN_AUDIO_BYTES:
+            return "Audio too short"
+
+        import numpy as np
+        samples = np.frombuffer(pcm[:len(pcm) & ~1], dtype=np.int16)
+        if int(np.abs(samples.astype(np.int32)).max(initial=0)) < cls.SILENCE_PEAK:
+            return "No speech detected"
+
+        return None
+
+    @staticmethod
+    def _to_pcm(audio_data: bytes, sample_rate: int) -> Tuple[bytes, int]:
+        """
+        Convert a WAV container to the mono s16le PCM the recognizer consumes.
+
+        The WAV header is stripped (otherwise it is decoded as audio), stereo
+        is downmixed, and the file's own sample rate is used instead of
+        assuming 16kHz. Non-WAV input is returned unchanged.
+        """
+        if audio_data[:4] != b"RIFF" or audio_data[8:12] != b"WAVE":
+            return audio_data, sample_rate
+
+        with wave.open(io.BytesIO(audio_data), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError("Only 16-bit PCM WAV audio is supported")
+            channels = wav.getnchannels()
+            sample_rate = wav.getframerate()
+            pcm = wav.readframes(wav.getnframes())
+
+        if channels > 1:
+            import numpy as np
+            samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, channels)
+            pcm = samples.mean(axis=1).astype(np.int16).tobytes()
+
+        return pcm, sample_rate
+
+    def _recognize(self, rec: "KaldiRecognizer", pcm: bytes, frame: int) -> List[str]:
+        """Feed PCM to the recognizer in frames and collect final segments."""
+        segments: List[str] = []
+
+        for start in range(0, len(pcm), frame):
+            if rec.AcceptWaveform(pcm[start:start + frame]):
+                text = _json_loads(rec.Result()).get("text", "")
+                if text:
+                    segments.append(text)
+
+        # Finalize: flush whatever the recognizer is still holding
+        text = _json_loads(rec.FinalResult()).get("text", "")
+        if text:
+            segments.append(text)
+
+        return segments
+
+    @staticmethod
+    def _build_result(segments: List[str]) -> Dict[str, Any]:
+        """Build the transcription response from finalized segments."""
+        if segments:
+            return {
+                "success": True,
+                "transcript": " ".join(segments),
+                "confidence": 1.0, # Vosk doesn't provide overall confidence easily in simple mode
+                "provider": "vosk"
+            }
+        return {
+            "success": False,
+            "error": "No speech detected",
+            "transcript": ""
+        }
@@ -0,0 +1,241 @@
+"""
+Unit Tests for Form Analytics
+
+Records events through the in-memory cache fallback (no Redis configured)
+and checks the computed insights and per-day event counters.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from services.ai import analytics as analytics_module
+from services.ai.analytics import FormAnalytics, EventType
+from utils import cache
+from utils.api_cache import cache_session_speech
+
+
+FORM_ID = "contact-form"
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    """Each test starts and ends with an empty fallback cache."""
+    cache._memory_cache.clear()
+    cache._memory_structures.clear()
+    yield
+    cache._memory_cache.clear()
+    cache._memory_structures.clear()
+
+
+@pytest.fixture
+def analytics():
+    return FormAnalytics()
+
+
+def _event(etype, session_id, at, field_id=None, **metadata):
+    event = {
+        "type": etype,
+        "form_id": FORM_ID,
+        "session_id": session_id,
+        "timestamp": at.isoformat(),
+    }
+    if field_id:
+        event["field_id"] = field_id
+    if metadata:
+        event["metadata"] = metadata
+    return event
+
+
+async def _record_two_sessions(analytics):
+    """One completed session (120s) and one abandoned at the phone field."""
+    start = datetime.now() - timedelta(hours=1)
+    events = [
+        _event(EventType.FORM_START, "s1", start),
+        _event(EventType.FIELD_FOCUS, "s1", start, "name", duration=20000),
+        _event(EventType.FIELD_CHANGE, "s1", start, "name"),
+        _event(EventType.FIELD_FOCUS, "s1", start, "email", duration=50000),
+        _event(EventType.FIELD_ERROR, "s1", start, "email", error="Invalid email format"),
+        _event(EventType.FORM_SUBMIT, "s1", start + timedelta(seconds=120)),
+        _event(EventType.FORM_START, "s2", start),
+        _event(EventType.FIELD_FOCUS, "s2", start, "name", duration=20000),
+        _event(EventType.FIELD_ERROR, "s2", start, "email", error="Invalid email format"),
+        _event(EventType.FIELD_FOCUS, "s2", start, "phone"),
+        _event(EventType.FORM_ABANDON, "s2", start + timedelta(seconds=30)),
+    ]
+    for event in events:
+        await analytics.track_event(event)
+
+
+# =============================================================================
+# Event Tracking Tests
+# =============================================================================
+
+class TestTrackEvent:
+    """Tests for recording events."""
+
+    @pytest.mark.asyncio
+    async def test_events_appended_to_form_list(self, analytics):
+        """Each event is appended to the form's capped event list."""
+        await _record_two_sessions(analytics)
+
+        stored = await cache.get_list_tail(
+            f"analytics:events:v2:{FORM_ID}", analytics_module.MAX_EVENTS_PER_FORM
+        )
+
+        assert len(stored) == 11
+
+    @pytest.mark.asyncio
+    async def test_event_list_is_capped(self, analytics, monkeypatch):
+        """Only the most recent MAX_EVENTS_PER_FORM events are kept."""
+        monkeypatch.setattr(analytics_module, "MAX_EVENTS_PER_FORM", 3)
+
+        for i in range(5):
+            await analytics.track_event(
+                _event(EventType.FIELD_CHANGE, f"s{i}", datetime.now(), "name")
+            )
+
+        stored = await cache.get_list_tail(f"analytics:events:v2:{FORM_ID}", 10)
+        sessions = [analytics_module._load_event(e)["session_id"] for e in stored]
+        assert sessions == ["s2", "s3", "s4"]
+
+    @pytest.mark.asyncio
+    async def test_privacy_fields_scrubbed(self, analytics):
+        """User IDs are hashed and field values are never stored."""
+        event = _event(EventType.FIELD_CHANGE, "s1", datetime.now(), "email", value="a@b.com")
+        event["user_id"] = "user-42"
+
+        await analytics.track_event(event)
+
+        stored = await cache.get_list_tail(f"analytics:events:v2:{FORM_ID}", 1)
+        recorded = analytics_module._load_event(stored[0])
+        assert recorded["user_id"] == analytics._hash_id("user-42")
+        assert recorded["user_id"] != "user-42"
+        assert "value" not in recorded["metadata"]
+
+
+# =============================================================================
+# Insights Tests
+# =============================================================================
+
+class TestFormInsights:
+    """Tests for insights computed from recorded events."""
+
+    @pytest.mark.asyncio
+    async def test_empty_form(self, analytics):
+        """A form without events returns empty sections."""
+        insights = await analytics.get_form_insights("unknown-form")
+
+        assert insights["summary"] == {}
+        assert insights["bottlenecks"] == []
+        assert insights["recommendations"] == []
+        assert insights["voice_stats"]["voice_sessions"] == 0
+        assert insights["daily_event_counts"] == {}
+
+    @pytest.mark.asyncio
+    async def test_daily_counts_outlive_event_list(self, analytics):
+        """Daily counters are still reported once the raw events are gone."""
+        await _record_two_sessions(analytics)
+        cache._memory_structures.pop(f"analytics:events:v2:{FORM_ID}")
+
+        insights = await analytics.get_form_insights(FORM_ID)
+
+        assert insights["summary"] == {}
+        today = datetime.now().strftime("%Y%m%d")
+        assert insights["daily_event_counts"][today][EventType.FORM_START] == 2
+
+    @pytest.mark.asyncio
+    async def test_summary(self, analytics):
+        """Completion, abandonment and timing are computed per session."""
+        await _record_two_sessions(analytics)
+
+        summary = (await analytics.get_form_insights(FORM_ID))["summary"]
+
+        assert summary["total_sessions"] == 2
+        assert summary["completion_rate"] == 0.5
+        assert summary["abandonment_rate"] == 0.5
+        assert summary["avg_completion_time_seconds"] == 120.0
+        assert summary["avg_fields_filled"] == 0.5
+        assert summary["avg_errors_per_session"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_bottlenecks_errors_and_dropouts(self, analytics):
+        """Slow fields, repeated errors and abandon points are ranked."""
+        await _record_two_sessions(analytics)
+
+        insights = await analytics.get_form_insights(FORM_ID)
+
+        assert insights["bottlenecks"] == [
+            {"field": "email", "avg_time_seconds": 50.0, "sample_count": 1, "severity": "high"},
+            {"field": "name", "avg_time_seconds": 20.0, "sample_count": 2, "severity": "medium"},
+        ]
+        assert insights["error_hotspots"] == [
+            {"field": "email", "error": "Invalid email format", "count": 2}
+        ]
+        assert insights["dropout_points"] == [{"field": "phone", "dropout_count": 1}]
+
+    @pytest.mark.asyncio
+    async def test_old_events_filtered_by_days(self, analytics):
+        """Events older than the requested window are ignored."""
+        old = datetime.now() - timedelta(days=10)
+        await analytics.track_event(_event(EventType.FORM_START, "old", old))
+        await analytics.track_event(_event(EventType.FORM_START, "new", datetime.now()))
+
+        summary = (await analytics.get_form_insights(FORM_ID, days=7))["summary"]
+
+        assert summary["total_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_daily_event_counts(self, analytics):
+        """Per-day counters are keyed by the day events were recorded."""
+        await _record_two_sessions(analytics)
+
+        daily = (await analytics.get_form_insights(FORM_ID))["daily_event_counts"]
+
+        today = datetime.now().strftime("%Y%m%d")
+        assert daily == {
+            today: {
+                EventType.FORM_START: 2,
+                EventType.FIELD_FOCUS: 4,
+                EventType.FIELD_CHANGE: 1,
+                EventType.FIELD_ERROR: 2,
+                EventType.FORM_SUBMIT: 1,
+                EventType.FORM_ABANDON: 1,
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_insights_cached(self, analytics):
+        """Insights are served from cache until they expire."""
+        await _record_two_sessions(analytics)
+        first = await analytics.get_form_insights(FORM_ID)
+
+        await analytics.track_event(_event(EventType.FORM_START, "s3", datetime.now()))
+        second = await analytics.get_form_insights(FORM_ID)
+
+        assert second == first
+        assert second["summary"]["total_sessions"] == 2
+
+
+# =============================================================================
+# Memory Fallback Tests
+# =============================================================================
+
+class TestMemoryFallback:
+    """Tests for analytics storage when Redis is not configured."""
+
+    @pytest.mark.asyncio
+    async def test_speech_caching_does_not_evict_analytics(self, analytics):
+        """Filling the LRU with session speech leaves events and counters intact."""
+        await _record_two_sessions(analytics)
+
+        for i in range(cache.MEMORY_CACHE_MAX_ENTRIES + 100):
+            await cache_session_speech("session", f"field_{i}", b"audio")
+
+        assert len(cache._memory_cache) == cache.MEMORY_CACHE_MAX_ENTRIES
+        stored = await cache.get_list_tail(
+            f"analytics:events:v2:{FORM_ID}", analytics_module.MAX_EVENTS_PER_FORM
+        )
+        assert len(stored) == 11
+        insights = await analytics.get_form_insights(FORM_ID)
+        assert insights["summary"]["total_sessions"] == 2
+        assert insights["daily_event_counts"]
@@ -0,0 +1,261 @@
+"""
+Tests for the Word Document Router
+
+Covers upload limits (size cap, zip-bomb rejection), on-disk expiry of
+uploaded and filled documents, and the /fill, /fill-async and /download
+response contracts.
+"""
+
+import io
+import os
+import time
+import zipfile
+
+import pytest
+from docx import Document
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import docx as docx_router
+from services.docx.docx_parser import check_docx_archive
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _make_docx(*paragraphs: str) -> bytes:
+    """Build a .docx in memory with one run per paragraph."""
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _make_zip_bomb() -> bytes:
+    """Build a zip whose single member inflates far beyond its compressed size."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", b"\0" * (30 * 1024 * 1024))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Point the router's upload/filled directories at a temp dir."""
+    upload_dir = tmp_path / "uploads"
+    filled_dir = tmp_path / "filled"
+    upload_dir.mkdir()
+    filled_dir.mkdir()
+    monkeypatch.setattr(docx_router, "UPLOAD_DIR", upload_dir)
+    monkeypatch.setattr(docx_router, "FILLED_DIR", filled_dir)
+    return upload_dir, filled_dir
+
+
+@pytest.fixture
+def client(storage):
+    """Test client for an app mounting only the docx router."""
+    app = FastAPI()
+    app.include_router(docx_router.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _upload(client, content: bytes, filename: str = "form.docx"):
+    return client.post(
+        "/docx/upload",
+        files={"file": (filename, content, docx_router.DOCX_MEDIA_TYPE)},
+    )
+
+
+def _age(path, seconds: int) -> None:
+    """Backdate a file's modification time."""
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+# =============================================================================
+# Archive Checks
+# =============================================================================
+
+class TestCheckDocxArchive:
+    """Tests for zip-bomb screening before python-docx opens a file."""
+
+    def test_accepts_regular_document(self):
+        """A normal document passes the archive checks."""
+        assert check_docx_archive(io.BytesIO(_make_docx("[Name]"))) is None
+
+    def test_rejects_high_compression_ratio(self):
+        """A highly compressible large member is rejected."""
+        reason = check_docx_archive(io.BytesIO(_make_zip_bomb()))
+
+        assert reason is not None
+        assert "compression ratio" in reason
+
+    def test_rejects_non_zip(self):
+        """Data that isn't a zip archive is rejected."""
+        reason = check_docx_archive(io.BytesIO(b"not a zip file"))
+
+        assert reason == "File is not a valid .docx document"
+
+
+# =============================================================================
+# Upload Tests
+# =============================================================================
+
+class TestUpload:
+    """Tests for POST /docx/upload."""
+
+    def test_upload_stores_document(self, client, storage):
+        """A valid upload returns fields and is stored under its docx_id."""
+        upload_dir, _ = storage
+
+        response = _upload(client, _make_docx("Name: [Name]"))
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["file_name"] == "form.docx"
+        assert (upload_dir / f"{body['docx_id']}.docx").exists()
+
+    def test_oversize_upload_rejected(self, client, storage, monkeypatch):
+        """Uploads over the size cap return 413 and leave nothing on disk."""
+        upload_dir, _ = storage
+        monkeypatch.setattr(docx_router, "MAX_UPLOAD_BYTES", 1024)
+
+        response = _upload(client, _make_docx("x" * 4096))
+
+        assert response.status_code == 413
+        assert list(upload_dir.iterdir()) == []
+
+    def test_zip_bomb_rejected(self, client, storage):
+        """Archives with a suspicious compression ratio return 400."""
+        upload_dir, _ = storage
+
+        response = _upload(client, _make_zip_bomb())
+
+        assert response.status_code == 400
+        assert "compression ratio" in response.json()["detail"]
+        assert list(upload_dir.iterdir()) == []
+
+    def test_legacy_doc_rejected(self, client):
+        """Legacy .doc uploads are refused."""
+        response = _upload(client, b"binary", filename="form.doc")
+
+        assert response.status_code == 400
+
+
+# =============================================================================
+# Expiry Tests
+# =============================================================================
+
+class TestExpiry:
+    """Tests for TTL-based expiry of stored documents."""
+
+    def test_expired_upload_not_found(self, client, storage):
+        """Filling an upload past its TTL returns 404 and deletes it."""
+        upload_dir, _ = storage
+        docx_id = _upload(client, _make_docx("[Name]")).json()["docx_id"]
+        stored = upload_dir / f"{docx_id}.docx"
+        _age(stored, docx_router.UPLOAD_TTL_SECONDS + 1)
+
+        response = client.post(f"/docx/fill?docx_id={docx_id}", json={"name": "Ada"})
+
+        assert response.status_code == 404
+        assert not stored.exists()
+
+    def test_expired_download_not_found(self, client, storage):
+        """Downloading a filled document past its TTL returns 404."""
+        _, filled_dir = storage
+        docx_id = _upload(client, _make_docx("[Name]")).json()["docx_id"]
+        download_id = client.post(
+            f"/docx/fill-async?docx_id={docx_id}", json={"name": "Ada"}
+        ).json()["download_id"]
+        _age(filled_dir / f"{download_id}.docx", docx_router.FILLED_TTL_SECONDS + 1)
+
+        response = client.get(f"/docx/download/{download_id}")
+
+        assert response.status_code == 404
+
+    def test_invalid_id_not_found(self, client):
+        """IDs that aren't UUIDs never touch the filesystem."""
+        response = client.get("/docx/download/not-a-uuid")
+
+        assert response.status_code == 404
+
+    def test_upload_sweeps_expired_files(self, client, storage):
+        """Each upload deletes stale files from both directories."""
+        upload_dir, filled_dir = storage
+        stale_upload = upload_dir / "stale.docx"
+        stale_filled = filled_dir / "stale.docx"
+        stale_upload.write_bytes(b"old")
+        stale_filled.write_bytes(b"old")
+        _age(stale_upload, docx_router.UPLOAD_TTL_SECONDS + 1)
+        _age(stale_filled, docx_router.FILLED_TTL_SECONDS + 1)
+
+        _upload(client, _make_docx("[Name]"))
+
+        assert not stale_upload.exists()
+        assert not stale_filled.exists()
+
+
+# =============================================================================
+# Fill Tests
+# =============================================================================
+
+class TestFill:
+    """Tests for the /fill, /fill-async and /download response contracts."""
+
+    def test_fill_streams_filled_document(self, client):
+        """/fill returns the filled .docx as an attachment."""
+        docx_id = _upload(client, _make_docx("Name: [Name]", "Email: [email address]")).json()["docx_id"]
+
+        response = client.post(
+            f"/docx/fill?docx_id={docx_id}",
+            json={"name": "Ada", "email_address": "ada@example.com"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == docx_router.DOCX_MEDIA_TYPE
+        assert "attachment" in response.headers["content-disposition"]
+        texts = [p.text for p in Document(io.BytesIO(response.content)).paragraphs]
+        assert texts == ["Name: Ada", "Email: ada@example.com"]
+
+    def test_fill_keeps_unknown_placeholders(self, client):
+        """Placeholders without a value are left untouched."""
+        docx_id = _upload(client, _make_docx("[Name] [Phone]")).json()["docx_id"]
+
+        response = client.post(f"/docx/fill?docx_id={docx_id}", json={"name": "Ada"})
+
+        texts = [p.text for p in Document(io.BytesIO(response.content)).paragraphs]
+        assert texts == ["Ada [Phone]"]
+
+    def test_fill_unknown_document(self, client):
+        """Filling an unknown docx_id returns 404."""
+        response = client.post(
+            "/docx/fill?docx_id=00000000-0000-0000-0000-000000000000",
+            json={"name": "Ada"},
+        )
+
+        assert response.status_code == 404
+
+    def test_fill_async_then_download(self, client):
+        """/fill-async returns a download_id that /download serves."""
+        docx_id = _upload(client, _make_docx("Name: [Name]")).json()["docx_id"]
+
+        response = client.post(f"/docx/fill-async?docx_id={docx_id}", json={"name": "Ada"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["fields_filled"] == 1
+
+        download = client.get(f"/docx/download/{body['download_id']}")
+
+        assert download.status_code == 200
+        assert download.headers["content-type"] == docx_router.DOCX_MEDIA_TYPE
+        assert "filled_document.docx" in download.headers["content-disposition"]
+        texts = [p.text for p in Document(io.BytesIO(download.content)).paragraphs]
+        assert texts == ["Name: Ada"]
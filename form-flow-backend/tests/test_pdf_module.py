@@ -120,6 +120,40 @@ class TestPdfSchemaConversion:
         assert d["total_pages"] == 2
         assert d["total_fields"] == 1
         assert len(d["fields"]) == 1
+    
+    def test_schema_from_dict_round_trip(self):
+        """PdfFormSchema.from_dict should restore fields needed for filling."""
+        from services.pdf.pdf_parser import FieldPosition, FieldConstraints
+        
+        schema = PdfFormSchema(
+            file_path="/test/form.pdf",
+            file_name="form.pdf",
+            total_pages=1,
+            fields=[
+                PdfField(
+                    id="f1",
+                    name="f1",
+                    field_type=FieldType.EMAIL,
+                    label="Email",
+                    position=FieldPosition(page=0, x=10, y=20, width=100, height=14),
+                    constraints=FieldConstraints(max_length=40, required=True),
+                    text_capacity=30,
+                    purpose="email",
+                ),
+            ],
+            is_scanned=True,
+        )
+        
+        restored = PdfFormSchema.from_dict(schema.to_dict())
+        
+        assert restored.is_scanned is True
+        assert restored.total_fields == 1
+        field = restored.fields[0]
+        assert field.field_type == FieldType.EMAIL
+        assert field.position == schema.fields[0].position
+        assert field.constraints.max_length == 40
+        assert field.text_capacity == 30
+        assert field.purpose == "email"
 
 
 
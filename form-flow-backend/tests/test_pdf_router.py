@@ -0,0 +1,167 @@
+"""
+Tests for the PDF Router
+
+Covers the content-addressed schema cache on /pdf/upload and filling
+PDFs that have no fillable fields.
+"""
+
+import io
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    TextStringObject,
+)
+
+from routers import pdf as pdf_router
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+def _make_form_pdf(value: str = "Ada") -> bytes:
+    """Build a one-page PDF with a single prefilled AcroForm text field."""
+    writer = PdfWriter()
+    page = writer.add_blank_page(width=612, height=792)
+    field = DictionaryObject({
+        NameObject("/Type"): NameObject("/Annot"),
+        NameObject("/Subtype"): NameObject("/Widget"),
+        NameObject("/FT"): NameObject("/Tx"),
+        NameObject("/T"): TextStringObject("full_name"),
+        NameObject("/V"): TextStringObject(value),
+        NameObject("/Rect"): ArrayObject(
+            [FloatObject(100), FloatObject(700), FloatObject(300), FloatObject(720)]
+        ),
+    })
+    ref = writer._add_object(field)
+    page[NameObject("/Annots")] = ArrayObject([ref])
+    writer._root_object[NameObject("/AcroForm")] = DictionaryObject(
+        {NameObject("/Fields"): ArrayObject([ref])}
+    )
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _make_blank_pdf() -> bytes:
+    """Build a one-page PDF with no form fields."""
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+async def _no_cleanup(_id: str):
+    """Stand-in for the delayed cleanup tasks, which sleep for up to an hour."""
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Point the router's storage directories at a temp dir."""
+    for name in ("UPLOAD_DIR", "FILLED_DIR", "SCHEMA_CACHE_DIR"):
+        directory = tmp_path / name.lower()
+        directory.mkdir()
+        monkeypatch.setattr(pdf_router, name, directory)
+    monkeypatch.setattr(pdf_router, "_cleanup_pdf", _no_cleanup)
+    monkeypatch.setattr(pdf_router, "_cleanup_filled", _no_cleanup)
+    return tmp_path
+
+
+@pytest.fixture
+def client(storage):
+    """Test client for an app mounting only the PDF router."""
+    app = FastAPI()
+    app.include_router(pdf_router.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _upload(client, content: bytes, filename: str = "form.pdf"):
+    return client.post(
+        "/pdf/upload",
+        files={"file": (filename, content, "application/pdf")},
+    )
+
+
+# =============================================================================
+# Schema Cache Tests
+# =============================================================================
+
+class TestSchemaCache:
+    """Tests for reusing parsed schemas across identical uploads."""
+
+    def test_identical_uploads_return_identical_responses(self, client, storage):
+        """A cache hit returns exactly what the original miss returned."""
+        content = _make_form_pdf()
+
+        first = _upload(client, content)
+        second = _upload(client, content)
+
+        assert first.status_code == second.status_code == 200
+        first_body, second_body = first.json(), second.json()
+        assert first_body.pop("pdf_id") != second_body.pop("pdf_id")
+        assert first_body == second_body
+        assert first_body["total_fields"] == 1
+        assert len(list((storage / "schema_cache_dir").glob("*.json"))) == 1
+
+    def test_field_values_not_returned_or_cached(self, client, storage):
+        """Prefilled values never appear in responses or the shared cache."""
+        response = _upload(client, _make_form_pdf("Secret Value"))
+
+        field = response.json()["fields"][0]
+        assert "current_value" not in field
+        assert "default_value" not in field
+        for path in (storage / "schema_cache_dir").glob("*.json"):
+            assert "Secret Value" not in path.read_text()
+
+    def test_upload_details_not_shared(self, client):
+        """Each upload reports its own file name, even on a cache hit."""
+        content = _make_form_pdf()
+        _upload(client, content, filename="first.pdf")
+
+        second = _upload(client, content, filename="second.pdf")
+        pdf_id = second.json()["pdf_id"]
+
+        assert second.json()["file_name"] == "second.pdf"
+        schema = pdf_router._get_upload_metadata(pdf_id)["schema"]
+        assert schema["file_name"] == "second.pdf"
+        assert schema["file_path"].endswith(f"{pdf_id}.pdf")
+
+
+# =============================================================================
+# Fill Tests
+# =============================================================================
+
+class TestFillWithoutFields:
+    """Tests for /pdf/fill on PDFs where parsing found nothing to fill."""
+
+    def test_returns_template_unchanged(self, client):
+        """The fill succeeds and the download is the original template."""
+        content = _make_blank_pdf()
+        pdf_id = _upload(client, content).json()["pdf_id"]
+
+        with patch.object(pdf_router, "fill_pdf") as fill:
+            response = client.post(
+                "/pdf/fill", json={"pdf_id": pdf_id, "data": {"name": "Ada"}}
+            )
+
+        fill.assert_not_called()
+        assert response.status_code == 200
+        body = response.json()
+        assert body["success"] is True
+        assert body["fields_filled"] == 0
+        assert body["fields_failed"] == 0
+        assert body["warnings"]
+
+        download = client.get(f"/pdf/download/{body['download_id']}")
+        assert download.status_code == 200
+        assert download.content == content
@@ -0,0 +1,182 @@
+"""
+Unit Tests for Vosk Transcription
+
+Tests for WAV-to-PCM conversion, the short/silent audio pre-checks, and
+deduplication of concurrent identical /transcribe requests.
+"""
+
+import asyncio
+import io
+import time
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from routers import speech
+from services.voice import vosk as vosk_module
+from services.voice.vosk import VoskService
+
+
+def _tone(samples: int = 16000, amplitude: int = 8000) -> np.ndarray:
+    """A 440Hz int16 tone at 16kHz."""
+    t = np.arange(samples) / 16000
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def _wav(pcm: bytes, sample_rate: int = 16000, channels: int = 1, width: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def loaded_service():
+    """A VoskService with a stand-in model, skipping model loading."""
+    service = VoskService.__new__(VoskService)
+    service.model = MagicMock()
+    return service
+
+
+# =============================================================================
+# PCM Conversion Tests
+# =============================================================================
+
+class TestToPcm:
+    """Tests for WAV header stripping and downmixing."""
+
+    def test_raw_pcm_unchanged(self):
+        """Headerless PCM passes through with the caller's sample rate."""
+        pcm = _tone().tobytes()
+
+        assert VoskService._to_pcm(pcm, 16000) == (pcm, 16000)
+
+    def test_wav_header_stripped(self):
+        """A mono WAV yields exactly its frames and its own sample rate."""
+        pcm = _tone().tobytes()
+
+        result, rate = VoskService._to_pcm(_wav(pcm, sample_rate=8000), 16000)
+
+        assert result == pcm
+        assert rate == 8000
+
+    def test_stereo_downmixed(self):
+        """Stereo frames are averaged into a single channel."""
+        left = _tone(amplitude=8000)
+        right = _tone(amplitude=4000)
+        stereo = np.column_stack([left, right]).astype(np.int16).tobytes()
+
+        result, _ = VoskService._to_pcm(_wav(stereo, channels=2), 16000)
+
+        mono = np.frombuffer(result, dtype=np.int16)
+        expected = ((left.astype(np.int32) + right) / 2).astype(np.int16)
+        assert len(mono) == len(left)
+        assert np.array_equal(mono, expected)
+
+    def test_non_16bit_rejected(self):
+        """8-bit WAV audio is not supported."""
+        with pytest.raises(ValueError):
+            VoskService._to_pcm(_wav(b"\x80" * 2000, width=1), 16000)
+
+
+# =============================================================================
+# Pre-check Tests
+# =============================================================================
+
+class TestPrecheck:
+    """Tests for rejecting audio before a decode starts."""
+
+    def test_too_short(self):
+        assert VoskService._precheck(b"\x00" * 100) == "Audio too short"
+
+    def test_silence(self):
+        silent = np.zeros(16000, dtype=np.int16).tobytes()
+
+        assert VoskService._precheck(silent) == "No speech detected"
+
+    def test_speech_passes(self):
+        assert VoskService._precheck(_tone().tobytes()) is None
+
+    def test_silent_wav_skips_recognizer(self, loaded_service):
+        """Silent uploads short-circuit without creating a recognizer."""
+        silent_wav = _wav(np.zeros(16000, dtype=np.int16).tobytes())
+
+        with patch.object(vosk_module, "KaldiRecognizer", create=True) as recognizer:
+            result = loaded_service.transcribe_audio(silent_wav)
+
+        recognizer.assert_not_called()
+        assert result == {"success": False, "error": "No speech detected", "transcript": ""}
+
+    def test_speech_reaches_recognizer_at_wav_rate(self, loaded_service):
+        """Audible WAV audio is decoded at the file's sample rate."""
+        audio = _wav(_tone().tobytes(), sample_rate=8000)
+
+        with patch.object(vosk_module, "KaldiRecognizer", create=True) as recognizer:
+            recognizer.return_value.AcceptWaveform.return_value = False
+            recognizer.return_value.FinalResult.return_value = '{"text": "hello"}'
+            result = loaded_service.transcribe_audio(audio)
+
+        recognizer.assert_called_once_with(loaded_service.model, 8000)
+        assert result["success"] is True
+        assert result["transcript"] == "hello"
+
+
+# =============================================================================
+# Request Deduplication Tests
+# =============================================================================
+
+class _SlowCountingService:
+    """Stand-in for VoskService that records how many decodes ran."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe_audio(self, audio_data, sample_rate=16000):
+        self.calls += 1
+        time.sleep(0.2)
+        return {"success": True, "transcript": f"decode {self.calls}", "provider": "vosk"}
+
+
+class TestTranscriptionDeduplication:
+    """Tests for collapsing identical in-flight transcriptions."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_decode(self):
+        service = _SlowCountingService()
+        audio = _tone().tobytes()
+
+        first, second = await asyncio.gather(
+            speech._transcribe_deduplicated(service, audio),
+            speech._transcribe_deduplicated(service, audio),
+        )
+
+        assert service.calls == 1
+        assert first is second
+        assert speech._inflight_transcriptions == {}
+
+    @pytest.mark.asyncio
+    async def test_different_audio_decoded_separately(self):
+        service = _SlowCountingService()
+
+        await asyncio.gather(
+            speech._transcribe_deduplicated(service, _tone(amplitude=8000).tobytes()),
+            speech._transcribe_deduplicated(service, _tone(amplitude=4000).tobytes()),
+        )
+
+        assert service.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_finished_requests_decode_again(self):
+        """Only in-flight work is shared; later identical uploads decode anew."""
+        service = _SlowCountingService()
+        audio = _tone().tobytes()
+
+        await speech._transcribe_deduplicated(service, audio)
+        await speech._transcribe_deduplicated(service, audio)
+
+        assert service.calls == 2
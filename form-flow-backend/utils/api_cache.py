@@ -13,6 +13,7 @@ Usage:
         ...
 """
 
+import base64
 import hashlib
 import json
 from typing import Optional, Callable, Any
@@ -138,3 +139,21 @@ async def invalidate_form_cache(url: str) -> None:
     cache_key = f"form_schema:{hashlib.md5(url.encode()).hexdigest()[:16]}"
     await delete_cached(cache_key)
     logger.debug(f"Invalidated cache for: {url[:50]}...")
+
+
+async def cache_session_speech(session_id: str, field_name: str, audio: bytes, ttl: int = 3600) -> None:
+    """
+    Cache TTS audio for one field of a scrape session.
+    
+    Audio is stored base64-encoded so it round-trips through the JSON
+    Redis cache; keys are scoped per session so concurrent scrapes of
+    forms with the same field names don't overwrite each other.
+    """
+    cache_key = f"speech:{session_id}:{field_name}"
+    await set_cached(cache_key, base64.b64encode(audio).decode("ascii"), ttl=ttl)
+
+
+async def get_session_speech(session_id: str, field_name: str) -> Optional[bytes]:
+    """Get cached TTS audio for a field of a scrape session, if any."""
+    encoded = await get_cached(f"speech:{session_id}:{field_name}")
+    return base64.b64decode(encoded) if encoded else None
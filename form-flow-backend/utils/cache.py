@@ -13,7 +13,9 @@ Usage:
 """
 
 import json
-from typing import Optional, Any
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Dict, Tuple, Union
 from functools import lru_cache
 
 from config.settings import settings
@@ -75,7 +77,75 @@ async def get_redis_client():
 # In-Memory Fallback Cache
 # =============================================================================
 
-_memory_cache: dict = {}
+# key -> (value, monotonic expiry time), least recently used first
+_memory_cache: OrderedDict = OrderedDict()
+
+# Lists and hash counters (analytics events and daily counters) are the
+# only copy of their data, so they are kept out of the LRU and only expire
+# by TTL; each list is already capped by its writer
+_memory_structures: Dict[str, Tuple[Any, float]] = {}
+
+# Bounds for the fallback cache: LRU size cap plus a periodic sweep of
+# expired entries so keys that are never read again don't pile up
+MEMORY_CACHE_MAX_ENTRIES = 500
+MEMORY_CACHE_SWEEP_INTERVAL = 60  # seconds
+_last_sweep = 0.0
+
+
+def _sweep_expired(now: float) -> None:
+    """Drop expired entries from both fallback stores, at most once per interval."""
+    global _last_sweep
+    if now - _last_sweep < MEMORY_CACHE_SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+    for store in (_memory_cache, _memory_structures):
+        for expired in [k for k, (_, exp) in store.items() if exp < now]:
+            del store[expired]
+
+
+def _memory_get(key: str) -> Optional[Any]:
+    """Read a live entry from the fallback cache, marking it recently used."""
+    entry = _memory_cache.get(key)
+    if entry is None:
+        return None
+    
+    value, expires_at = entry
+    if expires_at < time.monotonic():
+        _memory_cache.pop(key, None)
+        return None
+    _memory_cache.move_to_end(key)
+    return value
+
+
+def _memory_set(key: str, value: Any, ttl: int) -> None:
+    """Write to the fallback cache, sweeping expired and evicting LRU entries."""
+    now = time.monotonic()
+    _memory_cache[key] = (value, now + ttl)
+    _memory_cache.move_to_end(key)
+    _sweep_expired(now)
+    
+    while len(_memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+        _memory_cache.popitem(last=False)
+
+
+def _structure_get(key: str) -> Optional[Any]:
+    """Read a live list or hash from the fallback structure store."""
+    entry = _memory_structures.get(key)
+    if entry is None:
+        return None
+    
+    value, expires_at = entry
+    if expires_at < time.monotonic():
+        _memory_structures.pop(key, None)
+        return None
+    return value
+
+
+def _structure_set(key: str, value: Any, ttl: int) -> None:
+    """Write a list or hash to the fallback structure store (never LRU-evicted)."""
+    now = time.monotonic()
+    _memory_structures[key] = (value, now + ttl)
+    _sweep_expired(now)
 
 
 # =============================================================================
@@ -103,7 +173,7 @@ async def get_cached(key: str) -> Optional[Any]:
             logger.debug(f"Redis get failed: {e}")
     
     # Fallback to memory
-    return _memory_cache.get(key)
+    return _memory_get(key)
 
 
 async def set_cached(
@@ -131,8 +201,8 @@ async def set_cached(
         except Exception as e:
             logger.debug(f"Redis set failed: {e}")
     
-    # Fallback to memory (no TTL support)
-    _memory_cache[key] = value
+    # Fallback to memory (bounded, see _memory_set)
+    _memory_set(key, value, ttl)
     return True
 
 
@@ -147,6 +217,7 @@ async def delete_cached(key: str) -> bool:
             pass
     
     _memory_cache.pop(key, None)
+    _memory_structures.pop(key, None)
     return True
 
 
@@ -172,14 +243,114 @@ async def clear_cache_pattern(pattern: str) -> int:
             logger.debug(f"Redis pattern clear failed: {e}")
     
     # Clear from memory cache too
-    keys_to_delete = [k for k in _memory_cache if k.startswith(pattern.replace("*", ""))]
-    for key in keys_to_delete:
-        del _memory_cache[key]
-        count += 1
+    prefix = pattern.replace("*", "")
+    for store in (_memory_cache, _memory_structures):
+        keys_to_delete = [k for k in store if k.startswith(prefix)]
+        for key in keys_to_delete:
+            del store[key]
+            count += 1
     
     return count
 
 
+# =============================================================================
+# List Operations
+# =============================================================================
+
+async def push_capped(key: str, value: Union[str, bytes], max_len: int, ttl: int) -> bool:
+    """
+    Append a raw string to a capped list (RPUSH + LTRIM + EXPIRE).
+
+    Only the new entry travels over the wire, so appends stay O(1)
+    regardless of how many entries the list already holds.
+
+    Args:
+        key: List key
+        value: Pre-serialized entry (str or UTF-8 JSON bytes)
+        max_len: Number of most recent entries to keep
+        ttl: Time-to-live in seconds, refreshed on every push
+    """
+    redis = await get_redis_client()
+
+    if redis:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(key, value)
+                pipe.ltrim(key, -max_len, -1)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.debug(f"Redis list push failed: {e}")
+
+    items = _structure_get(key) or []
+    items.append(value)
+    del items[:-max_len]
+    _structure_set(key, items, ttl)
+    return True
+
+
+async def get_list_tail(key: str, count: int) -> list:
+    """
+    Get the last ``count`` raw entries of a list (LRANGE -count -1).
+
+    Returns:
+        List of entries, oldest first (empty if missing)
+    """
+    redis = await get_redis_client()
+
+    if redis:
+        try:
+            return await redis.lrange(key, -count, -1)
+        except Exception as e:
+            logger.debug(f"Redis list read failed: {e}")
+
+    items = _structure_get(key)
+    return items[-count:] if items else []
+
+
+# =============================================================================
+# Hash Counters
+# =============================================================================
+
+async def incr_hash(key: str, field: str, ttl: int, amount: int = 1) -> bool:
+    """
+    Increment a counter inside a hash (HINCRBY + EXPIRE).
+
+    The TTL is refreshed on every increment so counter keys always expire.
+    """
+    redis = await get_redis_client()
+
+    if redis:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(key, field, amount)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.debug(f"Redis hash increment failed: {e}")
+
+    counters = _structure_get(key) or {}
+    counters[field] = counters.get(field, 0) + amount
+    _structure_set(key, counters, ttl)
+    return True
+
+
+async def get_hash_counters(key: str) -> dict:
+    """Get all counters of a hash as ``{field: int}`` (empty if missing)."""
+    redis = await get_redis_client()
+
+    if redis:
+        try:
+            raw = await redis.hgetall(key)
+            return {field: int(count) for field, count in raw.items()}
+        except Exception as e:
+            logger.debug(f"Redis hash read failed: {e}")
+
+    return dict(_structure_get(key) or {})
+
+
 # =============================================================================
 # Health Check
 # =============================================================================
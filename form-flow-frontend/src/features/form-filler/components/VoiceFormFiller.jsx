@@ -3,7 +3,7 @@ import { Mic, MicOff, ChevronLeft, ChevronRight, SkipForward, Send, Volume2, Key
 import { motion, AnimatePresence } from 'framer-motion';
 import api, { API_BASE_URL, refineText, startConversationSession, sendConversationMessage, getSuggestions, getSmartSuggestions } from '@/services/api';
 
-const VoiceFormFiller = ({ formSchema, formContext, onComplete, onClose }) => {
+const VoiceFormFiller = ({ formSchema, formContext, speechSession, onComplete, onClose }) => {
     const [isListening, setIsListening] = useState(false);
     const [currentFieldIndex, setCurrentFieldIndex] = useState(0);
     const [formData, setFormData] = useState({});
@@ -274,7 +274,8 @@ const VoiceFormFiller = ({ formSchema, formContext, onComplete, onClose }) => {
 
     const playPrompt = async (fieldName) => {
         try {
-            const audio = new Audio(`${API_BASE_URL}/speech/${fieldName}?t=${Date.now()}`);
+            const sessionParam = speechSession ? `&session=${encodeURIComponent(speechSession)}` : '';
+            const audio = new Audio(`${API_BASE_URL}/speech/${fieldName}?t=${Date.now()}${sessionParam}`);
             audioRef.current = audio;
             audio.onended = () => {
                 idleTimeoutRef.current = setTimeout(() => playPrompt(fieldName), 20000);
@@ -154,6 +154,7 @@ const HomePage = () => {
             <VoiceFormFiller
                 formSchema={result.form_schema}
                 formContext={result.form_context}
+                speechSession={result.speech_session}
                 pdfId={pdfId}
                 onComplete={handleVoiceComplete}
             />